@@ -20,9 +20,41 @@ Forbidden:
 import argparse
 import sys
 
+from config.settings import (
+    CHUNK_MAX_TOKENS,
+    CHUNK_OVERLAP_TOKENS,
+    CHUNK_STRATEGY,
+    CASCADE_ESCALATE_SCORE,
+    DEDUP_SIGNALS,
+    GATE_MIN_RECALL,
+    GATE_MODE,
+    INFERENCE_MAX_CALLS,
+    INFERENCE_MAX_SECONDS,
+    INGEST_WORKERS,
+    LLM_BACKEND,
+    LLM_BATCH_MAX_TOKENS,
+    LLM_BATCH_SIGNALS,
+    LLM_CACHE_MODE,
+    LLM_CONCURRENCY,
+    LLM_MAX_OUTPUT_TOKENS,
+    LLM_MODEL_TIERS,
+    LLM_OUTPUT_MODE,
+    LLM_PROMPT_LAYOUT,
+    LLM_STREAM,
+    LLM_TIMEOUT,
+    PAGE_WORKERS,
+    PDF_BACKEND,
+    PER_PAPER_QUOTA,
+    RUN_DEADLINE_SECONDS,
+    STRIP_BOILERPLATE,
+)
 from contracts.input_contract import validate_inputs, InputValidationError
 from contracts.refusal import get_refusal_message
+from ingestion.backends import BACKENDS
 from pipeline.orchestrator import run
+from reasoning.llm_client import LLMClientError
+from reasoning.gate import GATE_MODES
+from reasoning.response_cache import CACHE_MODES
 
 
 def main():
@@ -45,6 +77,214 @@ def main():
         help="Maximum number of unanswered questions to extract (default: 3)."
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=INGEST_WORKERS,
+        help=f"Number of processes used to ingest papers in parallel (default: {INGEST_WORKERS})."
+    )
+
+    parser.add_argument(
+        "--page-workers",
+        type=int,
+        default=PAGE_WORKERS,
+        help="Number of processes used to extract page ranges of one large PDF "
+             f"(default: {PAGE_WORKERS})."
+    )
+
+    parser.add_argument(
+        "--pdf-backend",
+        choices=sorted(BACKENDS),
+        default=PDF_BACKEND,
+        help=f"PDF text extractor (default: {PDF_BACKEND})."
+    )
+
+    parser.add_argument(
+        "--keep-boilerplate",
+        action="store_true",
+        help="Do not strip lines repeated across pages (running headers, footers)."
+    )
+
+    parser.add_argument(
+        "--chunking",
+        choices=["page", "tokens"],
+        default=CHUNK_STRATEGY,
+        help="Chunk per page, or by token budget across page boundaries "
+             f"(default: {CHUNK_STRATEGY})."
+    )
+
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=CHUNK_MAX_TOKENS,
+        help=f"Token budget per chunk with --chunking tokens (default: {CHUNK_MAX_TOKENS})."
+    )
+
+    parser.add_argument(
+        "--chunk-overlap",
+        type=int,
+        default=CHUNK_OVERLAP_TOKENS,
+        help=f"Tokens repeated between consecutive chunks (default: {CHUNK_OVERLAP_TOKENS})."
+    )
+
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Send near-duplicate evidence excerpts to the model separately."
+    )
+
+    parser.add_argument(
+        "--max-llm-calls",
+        type=int,
+        default=INFERENCE_MAX_CALLS,
+        help=f"Maximum signals sent to the model per run (default: {INFERENCE_MAX_CALLS})."
+    )
+
+    parser.add_argument(
+        "--llm-time-budget",
+        type=float,
+        default=INFERENCE_MAX_SECONDS,
+        help="Stop dispatching new signals after this many seconds of inference."
+    )
+
+    parser.add_argument(
+        "--per-paper-quota",
+        type=int,
+        default=PER_PAPER_QUOTA,
+        help=f"Maximum signals per paper sent to the model (default: {PER_PAPER_QUOTA})."
+    )
+
+    parser.add_argument(
+        "--llm-backend",
+        choices=["http", "cli"],
+        default=LLM_BACKEND,
+        help="Talk to Ollama over its HTTP API with persistent connections, "
+             f"or spawn `ollama run` per prompt (default: {LLM_BACKEND})."
+    )
+
+    parser.add_argument(
+        "--llm-timeout",
+        type=float,
+        default=LLM_TIMEOUT,
+        help=f"Seconds before a single model call is abandoned (default: {LLM_TIMEOUT})."
+    )
+
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=LLM_CONCURRENCY,
+        help=f"Model calls in flight at once (default: {LLM_CONCURRENCY})."
+    )
+
+    parser.add_argument(
+        "--llm-batch-size",
+        type=int,
+        default=LLM_BATCH_SIGNALS,
+        help=f"Evidence signals packed into one prompt (default: {LLM_BATCH_SIGNALS})."
+    )
+
+    parser.add_argument(
+        "--llm-batch-tokens",
+        type=int,
+        default=LLM_BATCH_MAX_TOKENS,
+        help=f"Estimated prompt tokens per batched prompt (default: {LLM_BATCH_MAX_TOKENS})."
+    )
+
+    parser.add_argument(
+        "--llm-cache",
+        choices=CACHE_MODES,
+        default=LLM_CACHE_MODE,
+        help="Reuse cached model responses for identical prompts; read-only never "
+             f"writes new entries (default: {LLM_CACHE_MODE})."
+    )
+
+    parser.add_argument(
+        "--no-llm-stream",
+        action="store_true",
+        help="Wait for full completions instead of streaming and stopping early."
+    )
+
+    parser.add_argument(
+        "--llm-max-output-tokens",
+        type=int,
+        default=LLM_MAX_OUTPUT_TOKENS,
+        help=f"Tokens the model may generate per answer (default: {LLM_MAX_OUTPUT_TOKENS})."
+    )
+
+    parser.add_argument(
+        "--prompt-layout",
+        choices=["prefix", "inline"],
+        default=LLM_PROMPT_LAYOUT,
+        help="Send the fixed instructions as a reusable system prompt (prefix) "
+             f"or inline with the evidence (default: {LLM_PROMPT_LAYOUT})."
+    )
+
+    parser.add_argument(
+        "--gate",
+        choices=GATE_MODES,
+        default=GATE_MODE,
+        help="Skip signals predicted to be refused by the model (on), only log "
+             f"model outcomes to train the predictor (log), or neither (default: {GATE_MODE})."
+    )
+
+    parser.add_argument(
+        "--gate-recall",
+        type=float,
+        default=GATE_MIN_RECALL,
+        help="Share of signals the model would answer that the gate must still send "
+             f"(default: {GATE_MIN_RECALL})."
+    )
+
+    parser.add_argument(
+        "--models",
+        default=",".join(LLM_MODEL_TIERS),
+        help="Comma-separated model cascade, smallest first; malformed answers move "
+             f"up a tier (default: {','.join(LLM_MODEL_TIERS)})."
+    )
+
+    parser.add_argument(
+        "--escalate-score",
+        type=int,
+        default=CASCADE_ESCALATE_SCORE,
+        help="Signals scoring at least this go straight to the largest model "
+             f"(default: {CASCADE_ESCALATE_SCORE})."
+    )
+
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=RUN_DEADLINE_SECONDS,
+        help="Wall-clock seconds for the whole run; once another model call would "
+             "not finish in time, remaining signals get heuristic questions."
+    )
+
+    parser.add_argument(
+        "--llm-output",
+        choices=["text", "json"],
+        default=LLM_OUTPUT_MODE,
+        help="Ask for QUESTION/WHY/MISSING lines (text) or schema-constrained "
+             f"JSON answers (default: {LLM_OUTPUT_MODE})."
+    )
+
+    parser.add_argument(
+        "--no-ingest-cache",
+        action="store_true",
+        help="Bypass the on-disk cache of extracted pages for this run."
+    )
+
+    parser.add_argument(
+        "--clear-ingest-cache",
+        action="store_true",
+        help="Delete all cached extracted pages before running."
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Process each paper page by page with bounded memory "
+             "(ignores --page-workers and the ingestion cache)."
+    )
+
     parser.add_argument(
         "--output",
         type=str,
@@ -56,13 +296,46 @@ def main():
     try:
         validated_input = validate_inputs(
             papers=args.papers,
-            max_questions=args.max_questions
+            max_questions=args.max_questions,
+            workers=args.workers,
+            page_workers=args.page_workers,
+            ingest_cache=not args.no_ingest_cache,
+            clear_ingest_cache=args.clear_ingest_cache,
+            stream=args.stream,
+            pdf_backend=args.pdf_backend,
+            strip_boilerplate=STRIP_BOILERPLATE and not args.keep_boilerplate,
+            chunking=args.chunking,
+            chunk_tokens=args.chunk_tokens,
+            chunk_overlap=args.chunk_overlap,
+            dedup=DEDUP_SIGNALS and not args.no_dedup,
+            max_llm_calls=args.max_llm_calls,
+            llm_time_budget=args.llm_time_budget,
+            per_paper_quota=args.per_paper_quota,
+            llm_backend=args.llm_backend,
+            llm_timeout=args.llm_timeout,
+            llm_concurrency=args.llm_concurrency,
+            llm_batch_signals=args.llm_batch_size,
+            llm_batch_tokens=args.llm_batch_tokens,
+            llm_cache=args.llm_cache,
+            llm_stream=LLM_STREAM and not args.no_llm_stream,
+            llm_max_output_tokens=args.llm_max_output_tokens,
+            prompt_layout=args.prompt_layout,
+            gate=args.gate,
+            gate_recall=args.gate_recall,
+            llm_models=[m.strip() for m in args.models.split(",")],
+            escalate_score=args.escalate_score,
+            deadline=args.deadline,
+            llm_output=args.llm_output
         )
     except InputValidationError as e:
         print(get_refusal_message(e.code))
         sys.exit(1)
 
-    output = run(validated_input)
+    try:
+        output = run(validated_input)
+    except LLMClientError as e:
+        print(f"Local model call failed: {e.message}")
+        sys.exit(1)
 
     if args.output:
         with open(args.output, "w", encoding="utf-8") as f:
@@ -39,4 +39,8 @@ REFUSAL_MESSAGES = {
     "UNSUPPORTED_FILE": "Only PDF and text files are supported in v0.",
     "FILE_NOT_FOUND": "One or more provided paper paths do not exist.",
     "TOO_MANY_QUESTIONS": "Requested number of questions exceeds the allowed maximum.",
+    "INVALID_WORKERS": "Worker and concurrency counts must be at least 1.",
+    "INVALID_BUDGET": "Inference budgets and quotas must be positive.",
+    "INVALID_MODELS": "At least one model must be named for the model cascade.",
+    "INVALID_CHUNKING": "Chunk budget must be positive and larger than the overlap.",
 }
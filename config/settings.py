@@ -10,3 +10,156 @@ Examples:
 Note:
 - Changing values here should not make the system more permissive or less rigorous.
 """
+
+
+# config/settings.py
+
+"""
+Technical runtime settings. Each value can be overridden per run from the CLI.
+"""
+
+# --- Ingestion ---
+
+# Number of worker processes used to ingest papers in parallel (1 = serial)
+INGEST_WORKERS = 1
+
+# PDF text extractor (see ingestion.backends.BACKENDS)
+PDF_BACKEND = "pdfplumber"
+
+# Number of worker processes used to extract page ranges of one large PDF
+PAGE_WORKERS = 1
+
+# A PDF is only split when every range would get at least this many pages
+MIN_PAGES_PER_RANGE = 50
+
+# On-disk cache of extracted + cleaned pages, keyed by file hash
+INGEST_CACHE_DIR = ".cache/ingestion"
+INGEST_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Pseudo-page size for .txt papers that contain no form-feed page breaks
+TEXT_PAGE_LINES = 60
+
+# Strip lines that repeat across pages (running headers, footers, page numbers)
+STRIP_BOILERPLATE = True
+
+# A line is boilerplate when it appears on at least this many pages ...
+BOILERPLATE_MIN_PAGES = 3
+
+# ... and on at least this fraction of the document's pages
+BOILERPLATE_PAGE_RATIO = 0.5
+
+# In --stream mode repeated lines are learned from this many leading pages
+BOILERPLATE_SAMPLE_PAGES = 12
+
+# --- Structuring ---
+
+# Average characters per token used for token estimates
+CHARS_PER_TOKEN = 4
+
+# Chunking strategy: "page" (one page = one chunk) or "tokens" (token budget)
+CHUNK_STRATEGY = "page"
+
+# Token budget per chunk and overlap between consecutive chunks ("tokens" strategy)
+CHUNK_MAX_TOKENS = 400
+CHUNK_OVERLAP_TOKENS = 50
+
+# --- Evidence ---
+
+# Signal excerpts: character budget and sentences of context around each match
+EXCERPT_MAX_CHARS = 500
+EXCERPT_CONTEXT_SENTENCES = 1
+
+# Near-duplicate signal clustering (MinHash/LSH over excerpt word shingles)
+DEDUP_SIGNALS = True
+DEDUP_THRESHOLD = 0.5
+DEDUP_SHINGLE_SIZE = 3
+DEDUP_NUM_PERM = 64
+DEDUP_BANDS = 16
+
+# --- Reasoning ---
+
+# Local Ollama model used for question extraction
+LLM_MODEL = "phi3:mini"
+
+# Inference budget per run: signals sent to the model and wall-clock seconds
+# (None = unlimited)
+INFERENCE_MAX_CALLS = 10
+INFERENCE_MAX_SECONDS = None
+
+# Maximum signals per paper sent to the model (None = no quota)
+PER_PAPER_QUOTA = 2
+
+# LLM transport: "http" (Ollama HTTP API, persistent connections) or "cli" (`ollama run`)
+LLM_BACKEND = "http"
+
+# Ollama HTTP endpoint; the OLLAMA_HOST environment variable takes precedence
+OLLAMA_URL = "http://127.0.0.1:11434"
+
+# How long Ollama keeps the model loaded after a request
+OLLAMA_KEEP_ALIVE = "30m"
+
+# Seconds before a single model call is abandoned
+LLM_TIMEOUT = 300
+
+# Idle HTTP connections kept for reuse
+LLM_POOL_SIZE = 4
+
+# Model calls in flight at once (Ollama must allow parallel requests,
+# see OLLAMA_NUM_PARALLEL)
+LLM_CONCURRENCY = 1
+
+# Evidence signals packed into one prompt (1 = one prompt per signal).
+# Batches are also closed at LLM_BATCH_MAX_TOKENS estimated prompt tokens;
+# keep that well under the model's context window (Ollama num_ctx).
+LLM_BATCH_SIGNALS = 1
+LLM_BATCH_MAX_TOKENS = 1500
+
+# Model responses cached on disk, keyed by model, model digest and prompt.
+# Mode is "on", "read-only" (use entries, never write) or "off".
+LLM_CACHE_MODE = "on"
+LLM_CACHE_PATH = ".cache/llm/responses.sqlite3"
+LLM_CACHE_MAX_BYTES = 64 * 1024 * 1024
+LLM_CACHE_MAX_AGE_DAYS = 90
+
+# Read completions token by token (HTTP backend) so generation can stop as
+# soon as the answer is complete; LLM_MAX_OUTPUT_TOKENS caps each answer
+LLM_STREAM = True
+LLM_MAX_OUTPUT_TOKENS = 200
+
+# "prefix": fixed instructions as the system prompt, evidence as the prompt,
+# so the runtime can reuse the evaluated prefix; "inline": one prompt
+# with the evidence inside the instructions
+LLM_PROMPT_LAYOUT = "prefix"
+
+# --- Refusal gate ---
+# "log" records model outcomes to train the gate, "on" also skips signals
+# predicted to end in NO_VALID_QUESTION, "off" does neither
+GATE_MODE = "log"
+GATE_LOG_PATH = ".cache/llm/gate_outcomes.jsonl"
+GATE_LOG_MAX_ROWS = 5000
+# Outcomes needed before the classifier replaces the cold-start rules
+GATE_MIN_EXAMPLES = 50
+# Share of model-answered signals the classifier must still let through
+GATE_MIN_RECALL = 0.95
+# Share of predicted refusals sent to the model anyway for auditing
+GATE_AUDIT_RATE = 0.1
+GATE_MIN_WORDS = 8
+
+# Model cascade, smallest first. Answers that fail structural validation
+# are retried on the next tier; signals scoring at least
+# CASCADE_ESCALATE_SCORE go straight to the last tier.
+LLM_MODEL_TIERS = [LLM_MODEL]
+CASCADE_ESCALATE_SCORE = 8
+
+# Retries for transient model failures (timeouts, dropped connections,
+# server errors), with exponential backoff starting at LLM_RETRY_BACKOFF s
+LLM_RETRIES = 2
+LLM_RETRY_BACKOFF = 1.0
+
+# Wall-clock limit for a whole run in seconds (None = unbounded). Signals
+# the model can no longer be asked about in time get heuristic questions.
+RUN_DEADLINE_SECONDS = None
+
+# "text": QUESTION/WHY/MISSING lines; "json": answers constrained to the
+# JSON schemas in contracts/output_schema.py (Ollama structured outputs)
+LLM_OUTPUT_MODE = "text"
@@ -20,6 +20,34 @@ Forbidden:
 
 from pathlib import Path
 from config.constants import MIN_PAPERS, MAX_QUESTIONS, ALLOWED_EXTENSIONS
+from config.settings import (
+    CHUNK_MAX_TOKENS,
+    CHUNK_OVERLAP_TOKENS,
+    CHUNK_STRATEGY,
+    CASCADE_ESCALATE_SCORE,
+    DEDUP_SIGNALS,
+    GATE_MIN_RECALL,
+    GATE_MODE,
+    INFERENCE_MAX_CALLS,
+    INFERENCE_MAX_SECONDS,
+    INGEST_WORKERS,
+    LLM_BACKEND,
+    LLM_BATCH_MAX_TOKENS,
+    LLM_BATCH_SIGNALS,
+    LLM_CACHE_MODE,
+    LLM_CONCURRENCY,
+    LLM_MAX_OUTPUT_TOKENS,
+    LLM_MODEL_TIERS,
+    LLM_OUTPUT_MODE,
+    LLM_PROMPT_LAYOUT,
+    LLM_STREAM,
+    LLM_TIMEOUT,
+    PAGE_WORKERS,
+    PDF_BACKEND,
+    PER_PAPER_QUOTA,
+    RUN_DEADLINE_SECONDS,
+    STRIP_BOILERPLATE,
+)
 
 
 class InputValidationError(Exception):
@@ -28,7 +56,39 @@ class InputValidationError(Exception):
         super().__init__(code)
 
 
-def validate_inputs(papers, max_questions):
+def validate_inputs(
+    papers,
+    max_questions,
+    workers=INGEST_WORKERS,
+    page_workers=PAGE_WORKERS,
+    ingest_cache=True,
+    clear_ingest_cache=False,
+    stream=False,
+    pdf_backend=PDF_BACKEND,
+    strip_boilerplate=STRIP_BOILERPLATE,
+    chunking=CHUNK_STRATEGY,
+    chunk_tokens=CHUNK_MAX_TOKENS,
+    chunk_overlap=CHUNK_OVERLAP_TOKENS,
+    dedup=DEDUP_SIGNALS,
+    max_llm_calls=INFERENCE_MAX_CALLS,
+    llm_time_budget=INFERENCE_MAX_SECONDS,
+    per_paper_quota=PER_PAPER_QUOTA,
+    llm_backend=LLM_BACKEND,
+    llm_timeout=LLM_TIMEOUT,
+    llm_concurrency=LLM_CONCURRENCY,
+    llm_batch_signals=LLM_BATCH_SIGNALS,
+    llm_batch_tokens=LLM_BATCH_MAX_TOKENS,
+    llm_cache=LLM_CACHE_MODE,
+    llm_stream=LLM_STREAM,
+    llm_max_output_tokens=LLM_MAX_OUTPUT_TOKENS,
+    prompt_layout=LLM_PROMPT_LAYOUT,
+    gate=GATE_MODE,
+    gate_recall=GATE_MIN_RECALL,
+    llm_models=LLM_MODEL_TIERS,
+    escalate_score=CASCADE_ESCALATE_SCORE,
+    deadline=RUN_DEADLINE_SECONDS,
+    llm_output=LLM_OUTPUT_MODE,
+):
     if len(papers) < MIN_PAPERS:
         raise InputValidationError("TOO_FEW_PAPERS")
 
@@ -42,7 +102,58 @@ def validate_inputs(papers, max_questions):
     if max_questions > MAX_QUESTIONS:
         raise InputValidationError("TOO_MANY_QUESTIONS")
 
+    if workers < 1 or page_workers < 1 or llm_concurrency < 1:
+        raise InputValidationError("INVALID_WORKERS")
+
+    budgets = (
+        max_llm_calls, llm_time_budget, per_paper_quota, llm_timeout,
+        llm_batch_signals, llm_batch_tokens, llm_max_output_tokens, deadline,
+    )
+    for budget in budgets:
+        if budget is not None and budget <= 0:
+            raise InputValidationError("INVALID_BUDGET")
+
+    if not llm_models or not all(llm_models):
+        raise InputValidationError("INVALID_MODELS")
+
+    if not 0 < gate_recall <= 1:
+        raise InputValidationError("INVALID_BUDGET")
+
+    if chunking not in ("page", "tokens"):
+        raise InputValidationError("INVALID_CHUNKING")
+    if chunk_tokens < 1 or not 0 <= chunk_overlap < chunk_tokens:
+        raise InputValidationError("INVALID_CHUNKING")
+
     return {
         "papers": papers,
         "max_questions": max_questions,
+        "workers": workers,
+        "page_workers": page_workers,
+        "ingest_cache": ingest_cache,
+        "clear_ingest_cache": clear_ingest_cache,
+        "stream": stream,
+        "pdf_backend": pdf_backend,
+        "strip_boilerplate": strip_boilerplate,
+        "chunking": chunking,
+        "chunk_tokens": chunk_tokens,
+        "chunk_overlap": chunk_overlap,
+        "dedup": dedup,
+        "max_llm_calls": max_llm_calls,
+        "llm_time_budget": llm_time_budget,
+        "per_paper_quota": per_paper_quota,
+        "llm_backend": llm_backend,
+        "llm_timeout": llm_timeout,
+        "llm_concurrency": llm_concurrency,
+        "llm_batch_signals": llm_batch_signals,
+        "llm_batch_tokens": llm_batch_tokens,
+        "llm_cache": llm_cache,
+        "llm_stream": llm_stream,
+        "llm_max_output_tokens": llm_max_output_tokens,
+        "prompt_layout": prompt_layout,
+        "gate": gate,
+        "gate_recall": gate_recall,
+        "llm_models": list(llm_models),
+        "escalate_score": escalate_score,
+        "deadline": deadline,
+        "llm_output": llm_output,
     }
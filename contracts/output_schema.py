@@ -12,3 +12,55 @@ Forbidden:
 - Do NOT interpret research papers.
 - Do NOT allow free-form or conversational outputs.
 """
+
+
+# contracts/output_schema.py
+
+# Fields of one model answer, in the order the text format lists them
+ANSWER_FIELDS = ("question", "why", "missing")
+
+# JSON schema for one model answer in structured output mode. A refusal
+# is {"valid": false} with empty strings; it replaces NO_VALID_QUESTION.
+ANSWER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "valid": {"type": "boolean"},
+        "question": {"type": "string"},
+        "why": {"type": "string"},
+        "missing": {"type": "string"},
+    },
+    "required": ["valid", *ANSWER_FIELDS],
+}
+
+# JSON schema for a batched prompt: one numbered answer per evidence block
+BATCH_ANSWER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "answers": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "number": {"type": "integer"},
+                    **ANSWER_SCHEMA["properties"],
+                },
+                "required": ["number", *ANSWER_SCHEMA["required"]],
+            },
+        },
+    },
+    "required": ["answers"],
+}
+
+# One record of outputs/latest_results.json, in output order
+OUTPUT_FIELDS = (
+    "paper_id",
+    "page_number",
+    "signal_type",
+    "signal_score",
+    "question",
+    "why",
+    "missing",
+)
+
+# Written only when present on the question
+OPTIONAL_OUTPUT_FIELDS = ("heuristic", "heuristic_reason", "span", "cluster_members")
@@ -0,0 +1,134 @@
+# evaluation/backend_benchmark.py
+
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from ingestion.backends import BACKENDS
+from ingestion.loader import iter_pdf_pages
+from ingestion.parser import iter_clean_pages
+from ingestion.metadata import iter_metadata
+from structuring.chunker import iter_chunks
+from evidence.signals import extract_signals
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# =============================
+# Measurement
+# =============================
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    divisor = 1024 * 1024 if peak > 1 << 32 else 1024
+    return peak / divisor
+
+
+def _counted(pages, counter: dict):
+    for page in pages:
+        counter["pages"] += 1
+        yield page
+
+
+def _run_backend(job: tuple) -> dict:
+    """
+    Extract every PDF with one backend and feed it through signal detection.
+
+    Runs in a fresh process so ru_maxrss reflects this backend only.
+    """
+
+    backend, paths = job
+
+    counter = {"pages": 0}
+    signals = 0
+    errors = []
+
+    start = time.perf_counter()
+    for idx, path in enumerate(paths):
+        try:
+            pages = _counted(iter_pdf_pages(path, backend=backend), counter)
+            chunks = iter_chunks(
+                iter_metadata(iter_clean_pages(pages), paper_id=f"Paper {idx}")
+            )
+            signals += len(extract_signals(chunks))
+        except Exception as e:
+            errors.append(f"{path.name}: {e!r}")
+    elapsed = time.perf_counter() - start
+    pages = counter["pages"]
+
+    return {
+        "backend": backend,
+        "pages": pages,
+        "seconds": elapsed,
+        "pages_per_sec": pages / elapsed if elapsed > 0 else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "signals": signals,
+        "errors": errors,
+    }
+
+
+# =============================
+# Main
+# =============================
+
+def benchmark(directory: str, backends: list) -> list:
+    paths = sorted(Path(directory).glob("*.pdf"))
+
+    # spawn: a forked child would inherit the parent's peak RSS
+    context = multiprocessing.get_context("spawn")
+
+    results = []
+    for backend in backends:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.append(executor.submit(_run_backend, (backend, paths)).result())
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="backend-benchmark",
+        description="Compare PDF extraction backends on a directory of papers."
+    )
+    parser.add_argument("directory", help="Directory containing PDF files.")
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=sorted(BACKENDS),
+        default=sorted(BACKENDS),
+        help="Backends to compare (default: all)."
+    )
+    args = parser.parse_args()
+
+    results = benchmark(args.directory, args.backends)
+
+    print("\n==============================")
+    print("PDF Backend Benchmark")
+    print("==============================")
+    print(f"{'backend':<20}{'pages':>8}{'pages/s':>10}{'peak MB':>10}{'signals':>9}{'errors':>8}")
+    print("------------------------------")
+
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.1f}" if r["peak_rss_mb"] is not None else "n/a"
+        print(
+            f"{r['backend']:<20}{r['pages']:>8}{r['pages_per_sec']:>10.1f}"
+            f"{rss:>10}{r['signals']:>9}{len(r['errors']):>8}"
+        )
+
+    for r in results:
+        for error in r["errors"]:
+            print(f"[{r['backend']}] {error}")
+
+    print("==============================\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -57,6 +57,8 @@ def load_predictions(path: str):
 
     predictions = defaultdict(list)
     for item in data:
+        if item.get("heuristic"):
+            continue  # deadline / model-error fallback, not a model answer
         predictions[item["paper_id"]].append(item["question"])
     return predictions
 
@@ -76,6 +78,9 @@ def reconstruct_baseline_from_results(results_path: str):
     baseline_predictions = defaultdict(list)
 
     for item in data:
+        if item.get("heuristic"):
+            continue  # keep the baseline on the same signals as load_predictions
+
         # reconstruct pseudo-signal
         signal = {
             "signal_type": item.get("signal_type", ""),
@@ -0,0 +1,175 @@
+# evidence/batch_scoring.py
+
+"""
+Batch signal scoring over a chunk x pattern hit matrix.
+
+Text is scanned once into a matrix of hit counts; scores for every signal
+type are then array operations over that matrix, so trying new weights
+or thresholds never re-scans text. With the default weights the result
+matches evidence.signals.extract_signals.
+"""
+
+import numpy as np
+
+from evidence.matcher import match_banks
+from evidence.signals import (
+    MIN_SIGNAL_SCORE,
+    PHRASE_BANKS,
+    PHRASE_MATCHER,
+    SECTION_WEIGHT,
+    SIGNAL_TYPE_WEIGHT,
+    build_signal,
+    signal_section,
+)
+
+
+def build_hit_matrix(chunks, banks: dict = PHRASE_BANKS, matcher: dict = PHRASE_MATCHER) -> dict:
+    """
+    Scan every chunk once and record per-pattern hit counts.
+
+    Returns:
+    {
+        "hits": int32 array (n_chunks, n_patterns),
+        "patterns": [(signal_type, pattern), ...],   # column order
+        "pattern_bank": int array (n_patterns,),     # column -> bank index
+        "banks": [signal_type, ...],
+        "sections": [[section, ...], ...],           # per chunk and bank
+        "chunks": [chunk, ...],
+        "match_spans": [{signal_type: [(start, end), ...]}, ...]  # per chunk
+    }
+    """
+
+    bank_names = list(banks)
+    patterns = [(bank, p) for bank in bank_names for p in banks[bank]]
+    column = {key: i for i, key in enumerate(patterns)}
+
+    kept = []
+    rows = []
+    match_spans = []
+    sections = []
+
+    for chunk in chunks:
+        text = chunk.get("text", "")
+        if not text:
+            continue
+
+        matches = match_banks(text, matcher, chunk.get("overlap_chars", 0))
+        counts = matches["counts"]
+        row = np.zeros(len(patterns), dtype=np.int32)
+        for bank, per_pattern in counts.items():
+            for pattern, n in per_pattern.items():
+                row[column[(bank, pattern)]] = n
+
+        rows.append(row)
+        kept.append(chunk)
+        spans = {
+            bank: [(s, e) for _, s, e in bank_hits]
+            for bank, bank_hits in matches["hits"].items()
+        }
+        match_spans.append(spans)
+        sections.append([signal_section(chunk, spans[bank]) for bank in bank_names])
+
+    if rows:
+        hits = np.vstack(rows)
+    else:
+        hits = np.zeros((0, len(patterns)), dtype=np.int32)
+
+    return {
+        "hits": hits,
+        "patterns": patterns,
+        "pattern_bank": np.array([bank_names.index(b) for b, _ in patterns], dtype=np.intp),
+        "banks": bank_names,
+        "sections": sections,
+        "chunks": kept,
+        "match_spans": match_spans,
+    }
+
+
+def score_matrix(
+    matrix: dict,
+    type_weights: dict = SIGNAL_TYPE_WEIGHT,
+    section_weights: dict = SECTION_WEIGHT,
+    min_score: float = MIN_SIGNAL_SCORE,
+    pattern_weights=None
+) -> tuple:
+    """
+    Score every (chunk, signal type) pair at once.
+
+    score = type weight + sum of weights of distinct matched patterns
+            + section weight
+    pattern_weights defaults to 1 per pattern, which reproduces
+    _score_signal. Returns (scores, keep) arrays of shape (n_chunks, n_banks);
+    keep masks pairs with at least one hit and score >= min_score.
+    """
+
+    hits = matrix["hits"]
+    n_patterns = len(matrix["patterns"])
+    n_banks = len(matrix["banks"])
+
+    if pattern_weights is None:
+        pattern_weights = np.ones(n_patterns)
+
+    # (n_patterns, n_banks) projection of pattern columns onto their bank
+    projection = np.zeros((n_patterns, n_banks))
+    projection[np.arange(n_patterns), matrix["pattern_bank"]] = pattern_weights
+
+    present = (hits > 0).astype(float)
+    pattern_scores = present @ projection
+    any_hit = (present @ (projection != 0)) > 0
+
+    type_vector = np.array([type_weights.get(b, 0) for b in matrix["banks"]], dtype=float)
+
+    unknown = section_weights["unknown"]
+    names, codes = np.unique(
+        np.array([s.lower() for row in matrix["sections"] for s in row], dtype=object),
+        return_inverse=True
+    )
+    section_matrix = np.array(
+        [section_weights.get(n, unknown) for n in names], dtype=float
+    )[codes].reshape(hits.shape[0], n_banks)
+
+    scores = pattern_scores + type_vector[None, :] + section_matrix
+    keep = any_hit & (scores >= min_score)
+
+    return scores, keep
+
+
+def signals_from_scores(matrix: dict, scores, keep) -> list:
+    """
+    Materialise signal dicts for kept pairs, in chunk then bank order
+    (the same order extract_signals produces).
+    """
+
+    signals = []
+    hits = matrix["hits"]
+    patterns = matrix["patterns"]
+    pattern_bank = matrix["pattern_bank"]
+
+    for row, col in zip(*np.nonzero(keep)):
+        matched = [
+            patterns[j][1]
+            for j in np.nonzero((hits[row] > 0) & (pattern_bank == col))[0]
+        ]
+        score = scores[row, col]
+        bank = matrix["banks"][col]
+        signals.append(build_signal(
+            matrix["chunks"][row],
+            bank,
+            matched,
+            int(score) if float(score).is_integer() else float(score),
+            matrix["match_spans"][row][bank]
+        ))
+
+    return signals
+
+
+def extract_signals_batch(chunks, **weights) -> list:
+    """
+    Batch equivalent of evidence.signals.extract_signals.
+
+    Keyword arguments are passed to score_matrix.
+    """
+
+    matrix = build_hit_matrix(chunks)
+    scores, keep = score_matrix(matrix, **weights)
+    return signals_from_scores(matrix, scores, keep)
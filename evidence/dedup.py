@@ -0,0 +1,139 @@
+# evidence/dedup.py
+
+"""
+Near-duplicate signal clustering with MinHash + LSH.
+
+Signals whose excerpts share most of their word shingles are clustered so
+that only one representative per cluster reaches the LLM. Candidate pairs
+come from LSH band collisions, so cost grows with the number of signals
+rather than the number of signal pairs.
+"""
+
+import hashlib
+import re
+import struct
+from collections import defaultdict
+
+from config.settings import (
+    DEDUP_BANDS,
+    DEDUP_NUM_PERM,
+    DEDUP_SHINGLE_SIZE,
+    DEDUP_THRESHOLD,
+)
+
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# One SHAKE-128 digest per shingle yields all DEDUP_NUM_PERM 32-bit hash
+# values at once; keyless, so signatures are identical across runs.
+_UNPACK = struct.Struct(f"<{DEDUP_NUM_PERM}I").unpack
+_DIGEST_BYTES = 4 * DEDUP_NUM_PERM
+_EMPTY = tuple([0xFFFFFFFF] * DEDUP_NUM_PERM)
+
+
+def _shingles(text: str, size: int = DEDUP_SHINGLE_SIZE) -> set:
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {
+        " ".join(words[i:i + size])
+        for i in range(len(words) - size + 1)
+    }
+
+
+def minhash(text: str) -> tuple:
+    """MinHash signature of the excerpt's word shingles."""
+
+    vectors = [
+        _UNPACK(hashlib.shake_128(s.encode("utf-8")).digest(_DIGEST_BYTES))
+        for s in _shingles(text)
+    ]
+    if not vectors:
+        return _EMPTY
+
+    # Slot-wise minimum over all shingles
+    return tuple(map(min, zip(*vectors)))
+
+
+def _similarity(sig_a: tuple, sig_b: tuple) -> float:
+    """Estimated Jaccard similarity: share of equal MinHash slots."""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+
+def _find(parent: list, i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_signals(signals: list, threshold: float = DEDUP_THRESHOLD) -> list:
+    """
+    Group near-duplicate signals.
+
+    Returns clusters as lists of indices into signals, ordered by each
+    cluster's first member. Work is linear in the number of bucket
+    entries: signals x DEDUP_BANDS comparisons at most.
+    """
+
+    signatures = [minhash(s.get("text_excerpt", "")) for s in signals]
+    rows = DEDUP_NUM_PERM // DEDUP_BANDS
+
+    buckets = defaultdict(list)
+    for i, sig in enumerate(signatures):
+        for band in range(DEDUP_BANDS):
+            buckets[(band, sig[band * rows:(band + 1) * rows])].append(i)
+
+    parent = list(range(len(signals)))
+
+    # Each bucket member is compared with the bucket's first member only,
+    # so a bucket costs one comparison per member; a pair missed here can
+    # still meet in another band's bucket.
+    for members in buckets.values():
+        first = members[0]
+        for j in members[1:]:
+            root_i, root_j = _find(parent, first), _find(parent, j)
+            if root_i == root_j:
+                continue
+            if _similarity(signatures[first], signatures[j]) >= threshold:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    clusters = defaultdict(list)
+    for i in range(len(signals)):
+        clusters[_find(parent, i)].append(i)
+
+    return sorted(clusters.values(), key=lambda c: c[0])
+
+
+def dedup_signals(signals: list, threshold: float = DEDUP_THRESHOLD) -> list:
+    """
+    Keep the highest-scoring signal of each near-duplicate cluster.
+
+    The other members are attached to the representative as
+    "cluster_members" (paper_id, page_number, signal_type, signal_score)
+    so their provenance is not lost. Representatives keep input order.
+    """
+
+    kept = []
+
+    for cluster in cluster_signals(signals, threshold):
+        best = max(cluster, key=lambda i: (signals[i].get("signal_score", 0), -i))
+        representative = signals[best]
+
+        members = [
+            {
+                "paper_id": signals[i]["paper_id"],
+                "page_number": signals[i]["page_number"],
+                "signal_type": signals[i]["signal_type"],
+                "signal_score": signals[i].get("signal_score", 0),
+            }
+            for i in cluster
+            if i != best
+        ]
+        if members:
+            representative = {**representative, "cluster_members": members}
+
+        kept.append((best, representative))
+
+    kept.sort(key=lambda item: item[0])
+    return [signal for _, signal in kept]
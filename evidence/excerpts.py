@@ -0,0 +1,125 @@
+# evidence/excerpts.py
+
+import re
+from bisect import bisect_right
+
+from config.settings import (
+    CHARS_PER_TOKEN,
+    EXCERPT_CONTEXT_SENTENCES,
+    EXCERPT_MAX_CHARS,
+)
+
+
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*(?=\s)")
+
+SEPARATOR = " … "
+
+
+def _sentence_spans(text: str) -> list:
+    """Return [(start, end), ...] of sentences, whitespace trimmed."""
+
+    spans = []
+    start = 0
+
+    for m in _SENTENCE_END.finditer(text):
+        spans.append((start, m.end()))
+        start = m.end()
+    spans.append((start, len(text)))
+
+    trimmed = []
+    for s, e in spans:
+        while s < e and text[s].isspace():
+            s += 1
+        if s < e:
+            trimmed.append((s, e))
+    return trimmed
+
+
+def _windows(sentences: list, match_spans: list, context: int) -> list:
+    """Merge sentence-index windows around each match into char spans."""
+
+    starts = [s for s, _ in sentences]
+    ranges = []
+
+    for match_start, _ in sorted(match_spans):
+        i = max(bisect_right(starts, match_start) - 1, 0)
+        lo, hi = max(i - context, 0), min(i + context, len(sentences) - 1)
+        if ranges and lo <= ranges[-1][1] + 1:
+            ranges[-1][1] = max(ranges[-1][1], hi)
+        else:
+            ranges.append([lo, hi])
+
+    return [(sentences[lo][0], sentences[hi][1]) for lo, hi in ranges]
+
+
+def _clip_around(text: str, span: tuple, center: int, max_chars: int) -> tuple:
+    """Shrink span to max_chars around center, cutting at word boundaries."""
+
+    start = max(span[0], center - max_chars // 2)
+    end = min(span[1], start + max_chars)
+    start = max(span[0], end - max_chars)
+
+    if start > span[0]:
+        space = text.find(" ", start, end)
+        if space != -1:
+            start = space + 1
+    if end < span[1]:
+        space = text.rfind(" ", start, end)
+        if space != -1:
+            end = space
+
+    return start, end
+
+
+def build_excerpt(
+    text: str,
+    match_spans: list,
+    max_chars: int = EXCERPT_MAX_CHARS,
+    max_tokens: int = None,
+    context: int = EXCERPT_CONTEXT_SENTENCES
+) -> str:
+    """
+    Build a sentence-aligned excerpt around matched phrases.
+
+    Each match contributes the sentence it sits in plus `context`
+    neighbouring sentences on each side; overlapping windows are merged
+    and non-adjacent ones joined with SEPARATOR. If the result exceeds the
+    budget, context is dropped first, then later windows, and finally the
+    first window is clipped around its match.
+
+    The budget is max_chars, or max_tokens (estimated) when given.
+    """
+
+    if max_tokens is not None:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+
+    if not match_spans:
+        return text[:max_chars]
+
+    sentences = _sentence_spans(text)
+    if not sentences:
+        return ""
+
+    for ctx in (context, 0):
+        spans = _windows(sentences, match_spans, ctx)
+        size = sum(e - s for s, e in spans) + len(SEPARATOR) * (len(spans) - 1)
+        if size <= max_chars:
+            return SEPARATOR.join(text[s:e] for s, e in spans)
+
+    # Keep windows in text order while they fit
+    parts = []
+    used = 0
+    for s, e in spans:
+        cost = (e - s) + (len(SEPARATOR) if parts else 0)
+        if used + cost > max_chars:
+            break
+        parts.append(text[s:e])
+        used += cost
+
+    if parts:
+        return SEPARATOR.join(parts)
+
+    first_match = min(match_spans)
+    center = (first_match[0] + first_match[1]) // 2
+    s, e = _clip_around(text, spans[0], center, max_chars)
+    return text[s:e]
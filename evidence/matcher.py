@@ -0,0 +1,170 @@
+# evidence/matcher.py
+
+import re
+from typing import Dict, List
+
+
+# Characters that make a phrase a regular expression rather than a literal
+_REGEX_CHARS = set("\\.^$*+?{}[]|()")
+
+
+def _literal_variants(pattern: str):
+    """
+    Expand a pattern into the literal strings it matches, if it is a
+    literal with optional single characters ("suggests?" -> ["suggests",
+    "suggest"]). Returns None for anything more complex.
+    """
+
+    variants = [""]
+    i = 0
+
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch in _REGEX_CHARS:
+            return None
+        if pattern[i + 1:i + 2] == "?":
+            variants = [v + ch for v in variants] + variants
+            i += 2
+        else:
+            variants = [v + ch for v in variants]
+            i += 1
+
+    return [v for v in variants if v]
+
+
+def _trie_source(phrases: list) -> str:
+    """
+    Build a regex that walks a prefix trie of literal phrases.
+
+    ["may ", "might "] -> m(?:ay\\ |ight\\ ). At each text position the
+    engine follows at most one branch per character, so the cost of a
+    scan barely grows with the number of phrases.
+    """
+
+    root = {}
+    for phrase in phrases:
+        node = root
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        alternatives = [
+            re.escape(ch) + emit(child)
+            for ch, child in sorted(node.items())
+            if ch
+        ]
+        if "" in node:
+            alternatives.append("")
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return "(?:" + "|".join(alternatives) + ")"
+
+    return emit(root)
+
+
+def build_matcher(banks: Dict[str, List[str]]) -> dict:
+    """
+    Compile phrase banks into one multi-pattern matcher.
+
+    Literal phrases of all banks (including simple "x?" optionals) are
+    merged into a single trie-shaped regex; any other regex pattern
+    becomes an extra alternative. One search then finds every position
+    where any pattern of any bank starts.
+
+    Input:
+    {
+        "limitation": [pattern, ...],
+        ...
+    }
+    """
+
+    entries = []
+    literals = []
+    regexes = []
+
+    # Entries worth re-checking at a hit position, by lowercased first char
+    by_first = {}
+
+    for bank, patterns in banks.items():
+        for pattern in patterns:
+            index = len(entries)
+            entries.append((bank, pattern, re.compile(pattern, re.IGNORECASE)))
+
+            variants = _literal_variants(pattern.lower())
+            if variants is None:
+                regexes.append(index)
+                continue
+
+            literals.extend(variants)
+            for first in {v[0] for v in variants}:
+                by_first.setdefault(first, []).append(index)
+
+    alternatives = [f"(?:{entries[index][1]})" for index in regexes]
+    if literals:
+        alternatives.insert(0, _trie_source(literals))
+    source = "|".join(alternatives)
+
+    return {
+        "banks": list(banks),
+        "entries": entries,
+        "by_first": by_first,
+        "regexes": regexes,
+        "combined": re.compile(source),
+        "combined_ignorecase": re.compile(source, re.IGNORECASE),
+    }
+
+
+def match_banks(text: str, matcher: dict, seen: int = 0) -> dict:
+    """
+    Find every hit of every bank in a single pass over text.
+
+    Matching is case-insensitive and offsets point into text itself.
+    Hits that end within the first `seen` characters are left out: that
+    text was already matched as part of a previous, overlapping chunk.
+
+    Returns:
+    {
+        "hits": {bank: [(pattern, start, end), ...]},
+        "counts": {bank: {pattern: int}}
+    }
+    where patterns in counts keep their bank order.
+    """
+
+    entries = matcher["entries"]
+    hits = {bank: [] for bank in matcher["banks"]}
+    found = {}
+
+    subject = text.lower()
+    combined = matcher["combined"]
+    if len(subject) != len(text):
+        # Some characters change length when lowercased; offsets into the
+        # lowered copy would drift, so scan the original instead.
+        subject = text
+        combined = matcher["combined_ignorecase"]
+
+    pos = 0
+    while True:
+        m = combined.search(subject, pos)
+        if m is None:
+            break
+        pos = m.start()
+
+        # Several patterns can start at the same position
+        # (e.g. "limitation" / "limitations"); confirm each candidate.
+        candidates = matcher["by_first"].get(subject[pos].lower(), [])
+        for index in candidates + matcher["regexes"]:
+            bank, pattern, compiled = entries[index]
+            hit = compiled.match(text, pos)
+            if hit and hit.end() > seen:
+                hits[bank].append((pattern, pos, hit.end()))
+                found[index] = found.get(index, 0) + 1
+
+        pos += 1
+
+    counts = {bank: {} for bank in matcher["banks"]}
+    for index in sorted(found):
+        bank, pattern, _ = entries[index]
+        counts[bank][pattern] = found[index]
+
+    return {"hits": hits, "counts": counts}
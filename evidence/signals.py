@@ -1,7 +1,10 @@
 # evidence/signals.py
 
-import re
-from typing import List, Dict
+from typing import Dict, Iterable, List
+
+from evidence.excerpts import build_excerpt
+from evidence.matcher import build_matcher, match_banks
+from ingestion.metadata import section_at
 
 
 # --- Signal phrase banks (intentionally conservative) ---
@@ -38,6 +41,17 @@ ASSUMPTION_PATTERNS = [
 ]
 
 
+# Signal types in output order, each with its phrase bank
+PHRASE_BANKS = {
+    "limitation": LIMITATION_PATTERNS,
+    "uncertainty": UNCERTAINTY_PATTERNS,
+    "assumption": ASSUMPTION_PATTERNS
+}
+
+# All banks compiled once into a single-pass matcher
+PHRASE_MATCHER = build_matcher(PHRASE_BANKS)
+
+
 # --- v1 signal strength weights ---
 # Higher = more research-significant
 
@@ -59,18 +73,6 @@ SECTION_WEIGHT = {
 MIN_SIGNAL_SCORE = 4
 
 
-def _match_patterns(text: str, patterns: List[str]) -> List[str]:
-    """Return list of matched patterns (case-insensitive)."""
-    matches = []
-    lowered = text.lower()
-
-    for pattern in patterns:
-        if re.search(pattern, lowered):
-            matches.append(pattern)
-
-    return matches
-
-
 def _score_signal(
     signal_type: str,
     matched_patterns: List[str],
@@ -94,10 +96,57 @@ def _score_signal(
     return score
 
 
-def extract_signals(chunks: List[Dict]) -> List[Dict]:
+def signal_section(chunk: Dict, match_spans) -> str:
+    """
+    Section at the first match, from the chunk's section spans when it
+    has them; otherwise the chunk's own section.
+    """
+
+    spans = chunk.get("sections")
+    if spans and match_spans:
+        return section_at(spans, min(start for start, _ in match_spans))
+    return chunk.get("section", "unknown")
+
+
+def build_signal(
+    chunk: Dict,
+    signal_type: str,
+    matched_patterns: List[str],
+    score: int,
+    match_spans: List[tuple] = ()
+) -> Dict:
+    """
+    Build one signal record from a chunk.
+
+    text_excerpt is a sentence-aligned window around match_spans (offsets
+    into the chunk text), so it contains the evidence that triggered the
+    signal rather than whatever opens the page.
+
+    Page spans from token-budgeted chunks are carried over as provenance.
+    """
+
+    text = chunk["text"]
+    signal = {
+        "signal_type": signal_type,
+        "matched_patterns": matched_patterns,
+        "signal_score": score,
+        "paper_id": chunk["paper_id"],
+        "page_number": chunk["page_number"],
+        "section": signal_section(chunk, match_spans),
+        "text_excerpt": build_excerpt(text, list(match_spans))
+    }
+
+    if "span" in chunk:
+        signal["span"] = chunk["span"]
+
+    return signal
+
+
+def extract_signals(chunks: Iterable[Dict]) -> List[Dict]:
     """
     Extract and score evidence signals from chunks.
 
+    chunks may be a lazy iterator; each chunk is only visited once.
     Only signals above MIN_SIGNAL_SCORE are retained.
     """
 
@@ -108,51 +157,16 @@ def extract_signals(chunks: List[Dict]) -> List[Dict]:
         if not text:
             continue
 
-        section = chunk.get("section", "unknown")
+        matches = match_banks(text, PHRASE_MATCHER, chunk.get("overlap_chars", 0))
 
-        # --- limitation signals ---
-        limitation_hits = _match_patterns(text, LIMITATION_PATTERNS)
-        if limitation_hits:
-            score = _score_signal("limitation", limitation_hits, section)
-            if score >= MIN_SIGNAL_SCORE:
-                signals.append({
-                    "signal_type": "limitation",
-                    "matched_patterns": limitation_hits,
-                    "signal_score": score,
-                    "paper_id": chunk["paper_id"],
-                    "page_number": chunk["page_number"],
-                    "section": section,
-                    "text_excerpt": text[:500]
-                })
-
-        # --- uncertainty signals ---
-        uncertainty_hits = _match_patterns(text, UNCERTAINTY_PATTERNS)
-        if uncertainty_hits:
-            score = _score_signal("uncertainty", uncertainty_hits, section)
-            if score >= MIN_SIGNAL_SCORE:
-                signals.append({
-                    "signal_type": "uncertainty",
-                    "matched_patterns": uncertainty_hits,
-                    "signal_score": score,
-                    "paper_id": chunk["paper_id"],
-                    "page_number": chunk["page_number"],
-                    "section": section,
-                    "text_excerpt": text[:500]
-                })
-
-        # --- assumption signals ---
-        assumption_hits = _match_patterns(text, ASSUMPTION_PATTERNS)
-        if assumption_hits:
-            score = _score_signal("assumption", assumption_hits, section)
+        for signal_type in PHRASE_BANKS:
+            hits = list(matches["counts"][signal_type])
+            if not hits:
+                continue
+
+            spans = [(s, e) for _, s, e in matches["hits"][signal_type]]
+            score = _score_signal(signal_type, hits, signal_section(chunk, spans))
             if score >= MIN_SIGNAL_SCORE:
-                signals.append({
-                    "signal_type": "assumption",
-                    "matched_patterns": assumption_hits,
-                    "signal_score": score,
-                    "paper_id": chunk["paper_id"],
-                    "page_number": chunk["page_number"],
-                    "section": section,
-                    "text_excerpt": text[:500]
-                })
+                signals.append(build_signal(chunk, signal_type, hits, score, spans))
 
     return signals
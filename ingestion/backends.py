@@ -0,0 +1,116 @@
+# ingestion/backends.py
+
+"""
+PDF text extraction backends.
+
+Each backend is a pair of functions:
+- count(path) -> int: number of pages in the document
+- extract(path, start, end): yield (page_number, text) for pages [start, end)
+
+Backend libraries are imported lazily so only the selected one has to be
+installed.
+"""
+
+import io
+
+
+# --- pdfplumber ---
+
+def _pdfplumber_count(path) -> int:
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def _pdfplumber_pages(path, start: int, end: int, simple: bool):
+    import pdfplumber
+
+    with pdfplumber.open(path, pages=list(range(start + 1, end + 1))) as pdf:
+        for page in pdf.pages:
+            if simple:
+                text = page.extract_text_simple()
+            else:
+                text = page.extract_text()
+            # Drop the parsed layout objects as soon as the text is out
+            page.flush_cache()
+            yield page.page_number, text or ""
+
+
+def _pdfplumber_extract(path, start: int, end: int):
+    """Character clustering into lines (accurate, slowest)."""
+    return _pdfplumber_pages(path, start, end, simple=False)
+
+
+def _pdfplumber_simple_extract(path, start: int, end: int):
+    """Line grouping by y-position only, no word-level layout pass."""
+    return _pdfplumber_pages(path, start, end, simple=True)
+
+
+# --- pdfminer.six (raw text stream, layout analysis disabled) ---
+
+def _pdfminer_count(path) -> int:
+    from pdfminer.pdfpage import PDFPage
+
+    with open(path, "rb") as f:
+        return sum(1 for _ in PDFPage.get_pages(f))
+
+
+def _pdfminer_extract(path, start: int, end: int):
+    from pdfminer.converter import TextConverter
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    resources = PDFResourceManager()
+
+    with open(path, "rb") as f:
+        pagenos = set(range(start, end))
+        for index, page in enumerate(PDFPage.get_pages(f, pagenos=pagenos)):
+            buffer = io.StringIO()
+            # laparams=None skips layout analysis and emits the content stream order
+            device = TextConverter(resources, buffer, laparams=None)
+            PDFPageInterpreter(resources, device).process_page(page)
+            device.close()
+            yield start + index + 1, buffer.getvalue()
+
+
+# --- pypdf ---
+
+def _pypdf_count(path) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(path).pages)
+
+
+def _pypdf_extract(path, start: int, end: int):
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    for index in range(start, end):
+        yield index + 1, reader.pages[index].extract_text() or ""
+
+
+BACKENDS = {
+    "pdfplumber": {
+        "count": _pdfplumber_count,
+        "extract": _pdfplumber_extract,
+    },
+    "pdfplumber-simple": {
+        "count": _pdfplumber_count,
+        "extract": _pdfplumber_simple_extract,
+    },
+    "pdfminer": {
+        "count": _pdfminer_count,
+        "extract": _pdfminer_extract,
+    },
+    "pypdf": {
+        "count": _pypdf_count,
+        "extract": _pypdf_extract,
+    },
+}
+
+
+def get_backend(name: str) -> dict:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend: {name}")
+    return BACKENDS[name]
@@ -0,0 +1,123 @@
+# ingestion/boilerplate.py
+
+import math
+import re
+from collections import Counter
+from itertools import chain, islice
+
+from config.settings import (
+    BOILERPLATE_MIN_PAGES,
+    BOILERPLATE_PAGE_RATIO,
+    BOILERPLATE_SAMPLE_PAGES,
+)
+from structuring.tokens import estimate_tokens
+
+
+_DIGITS = re.compile(r"\d+")
+
+
+def _line_key(line: str) -> int:
+    """
+    Hash of a normalised line. Digit runs collapse to '#', so
+    "Page 3 of 12" and "Page 4 of 12" count as the same line.
+    """
+
+    normalized = " ".join(line.lower().split())
+    return hash(_DIGITS.sub("#", normalized))
+
+
+def new_report() -> dict:
+    return {
+        "lines_removed": 0,
+        "chars_removed": 0,
+        "tokens_removed": 0,
+    }
+
+
+def count_line_pages(pages) -> tuple:
+    """
+    Single linear pass: count on how many pages each line hash occurs.
+
+    Only hashes are kept, so memory follows the number of distinct lines,
+    not the document text. Returns (counts, page_count).
+    """
+
+    counts = Counter()
+    page_count = 0
+
+    for page in pages:
+        page_count += 1
+        counts.update({
+            _line_key(line)
+            for line in page["text"].splitlines()
+            if line.strip()
+        })
+
+    return counts, page_count
+
+
+def repeated_line_keys(counts: Counter, page_count: int) -> set:
+    threshold = max(
+        BOILERPLATE_MIN_PAGES,
+        math.ceil(page_count * BOILERPLATE_PAGE_RATIO)
+    )
+    return {key for key, n in counts.items() if n >= threshold}
+
+
+def iter_strip_boilerplate(pages, repeated: set, report: dict):
+    """
+    Yield pages with repeated lines removed, updating report in place.
+
+    Must run on raw page text: clean_text joins lines and would hide them.
+    """
+
+    for page in pages:
+        kept = []
+        for line in page["text"].splitlines():
+            if line.strip() and _line_key(line) in repeated:
+                report["lines_removed"] += 1
+                report["chars_removed"] += len(line)
+                report["tokens_removed"] += estimate_tokens(line)
+            else:
+                kept.append(line)
+
+        yield {**page, "text": "\n".join(kept)}
+
+
+def iter_strip_boilerplate_sampled(
+    pages,
+    report: dict,
+    sample_pages: int = BOILERPLATE_SAMPLE_PAGES
+):
+    """
+    Streaming strip_boilerplate over a single pass of pages.
+
+    Repeated lines are learned from the first sample_pages pages, which
+    are held back until then; so memory is bounded by the sample and the
+    document is only extracted once. Documents no longer than the sample
+    are stripped exactly as strip_boilerplate would.
+    """
+
+    pages = iter(pages)
+    sample = list(islice(pages, sample_pages))
+    counts, page_count = count_line_pages(sample)
+    repeated = repeated_line_keys(counts, page_count)
+
+    yield from iter_strip_boilerplate(chain(sample, pages), repeated, report)
+
+
+def strip_boilerplate(pages: list) -> tuple:
+    """
+    Remove running headers, footers, banners and page numbers.
+
+    Returns (stripped_pages, report) where report counts what was removed.
+    """
+
+    report = new_report()
+    counts, page_count = count_line_pages(pages)
+    repeated = repeated_line_keys(counts, page_count)
+
+    if not repeated:
+        return pages, report
+
+    return list(iter_strip_boilerplate(pages, repeated, report)), report
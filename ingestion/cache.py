@@ -0,0 +1,124 @@
+# ingestion/cache.py
+
+import hashlib
+import json
+import os
+import zlib
+from pathlib import Path
+
+from config.settings import INGEST_CACHE_DIR, INGEST_CACHE_MAX_BYTES
+
+
+_SUFFIX = ".json.z"
+
+# Bump when the stored payload layout changes; old entries then miss
+_FORMAT_VERSION = "3"
+_READ_BLOCK = 1 << 20
+
+
+def cache_key(path: str, extractor_version: str) -> str:
+    """
+    Content-addressed key: hash of the file bytes plus the extractor version.
+    Renaming or moving a paper keeps its entry; editing it does not.
+    """
+
+    digest = hashlib.sha256(f"{_FORMAT_VERSION}:{extractor_version}".encode("utf-8"))
+
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_READ_BLOCK), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def _entry_path(key: str, cache_dir: str) -> Path:
+    return Path(cache_dir) / f"{key}{_SUFFIX}"
+
+
+def load_cached(key: str, cache_dir: str = INGEST_CACHE_DIR):
+    """
+    Return the cached payload for key, or None on a miss.
+
+    A hit refreshes the entry's mtime, which is what LRU eviction orders by.
+    """
+
+    entry = _entry_path(key, cache_dir)
+
+    try:
+        payload = entry.read_bytes()
+        data = json.loads(zlib.decompress(payload).decode("utf-8"))
+    except (OSError, ValueError, zlib.error):
+        return None
+
+    try:
+        os.utime(entry)
+    except OSError:
+        pass
+
+    return data
+
+
+def store_cached(
+    key: str,
+    data,
+    cache_dir: str = INGEST_CACHE_DIR,
+    max_bytes: int = INGEST_CACHE_MAX_BYTES
+) -> None:
+    """
+    Store a payload as compressed compact JSON, then enforce the size cap.
+
+    Writes go through a temporary file and os.replace so parallel ingestion
+    workers never observe a partial entry.
+    """
+
+    directory = Path(cache_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    payload = zlib.compress(
+        json.dumps(data, separators=(",", ":")).encode("utf-8")
+    )
+
+    entry = _entry_path(key, cache_dir)
+    tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, entry)
+
+    _evict(directory, max_bytes)
+
+
+def _evict(directory: Path, max_bytes: int) -> None:
+    """Delete least recently used entries until the cache fits max_bytes."""
+
+    entries = []
+    for entry in directory.glob(f"*{_SUFFIX}"):
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue  # removed by a concurrent worker
+        entries.append((stat.st_mtime, stat.st_size, entry))
+
+    total = sum(size for _, size, _ in entries)
+
+    for _, size, entry in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        try:
+            entry.unlink()
+        except OSError:
+            continue
+        total -= size
+
+
+def clear_cache(cache_dir: str = INGEST_CACHE_DIR) -> int:
+    """Remove every cache entry. Returns the number of entries removed."""
+
+    removed = 0
+
+    for entry in Path(cache_dir).glob(f"*{_SUFFIX}"):
+        try:
+            entry.unlink()
+            removed += 1
+        except OSError:
+            continue
+
+    return removed
@@ -1,13 +1,84 @@
 # ingestion/loader.py
 
-import pdfplumber
+import math
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from config.settings import MIN_PAGES_PER_RANGE, PDF_BACKEND
+from ingestion.backends import get_backend
 
-def load_pdf(path: str) -> list:
+
+# Bump whenever extraction output can change for the same file bytes;
+# together with the backend name it forms the ingestion cache key.
+EXTRACTOR_VERSION = "1"
+
+
+def extractor_version(backend: str = PDF_BACKEND) -> str:
+    return f"{backend}-{EXTRACTOR_VERSION}"
+
+
+def _iter_range(path, start: int, end: int, backend: str):
+    for page_number, text in get_backend(backend)["extract"](path, start, end):
+        yield {
+            "page_number": page_number,
+            "text": text.strip()
+        }
+
+
+def _extract_range(job: tuple) -> list:
+    """
+    Extract pages [start, end) of a PDF in the current process.
+
+    Each worker opens the file itself; parser objects cannot be pickled.
+    page_number stays the 1-based number within the whole document.
+    """
+
+    path, start, end, backend = job
+    return list(_iter_range(path, start, end, backend))
+
+
+def plan_page_ranges(page_count: int, workers: int) -> list:
+    """
+    Split a page count into contiguous [start, end) ranges.
+
+    The split threshold follows from the page count: a document is only
+    split when each range gets at least MIN_PAGES_PER_RANGE pages, so short
+    papers stay on the serial path where process start-up would dominate.
+    """
+
+    n_ranges = min(workers, page_count // MIN_PAGES_PER_RANGE)
+
+    if n_ranges <= 1:
+        return [(0, page_count)]
+
+    size = math.ceil(page_count / n_ranges)
+    return [
+        (start, min(start + size, page_count))
+        for start in range(0, page_count, size)
+    ]
+
+
+def iter_pdf_pages(path: str, backend: str = PDF_BACKEND):
+    """
+    Yield page-level raw text entries one page at a time.
+
+    Same entries as load_pdf, but only the current page is held in memory.
+    """
+
+    pdf_path = Path(path)
+    page_count = get_backend(backend)["count"](pdf_path)
+
+    yield from _iter_range(pdf_path, 0, page_count, backend)
+
+
+def load_pdf(path: str, workers: int = 1, backend: str = PDF_BACKEND) -> list:
     """
     Load a PDF and return a list of page-level raw text entries.
 
+    With workers > 1, large PDFs are split into page ranges that are
+    extracted in separate processes and reassembled in page order.
+    backend selects the text extractor (see ingestion.backends).
+
     Returns:
     [
         {
@@ -17,16 +88,20 @@ def load_pdf(path: str) -> list:
         ...
     ]
     """
-    pages = []
-
     pdf_path = Path(path)
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for i, page in enumerate(pdf.pages):
-            text = page.extract_text() or ""
-            pages.append({
-                "page_number": i + 1,
-                "text": text.strip()
-            })
+    page_count = get_backend(backend)["count"](pdf_path)
+    jobs = [
+        (pdf_path, start, end, backend)
+        for start, end in plan_page_ranges(page_count, workers)
+    ]
+
+    if len(jobs) == 1:
+        return _extract_range(jobs[0])
+
+    pages = []
+    with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+        for chunk in executor.map(_extract_range, jobs):
+            pages.extend(chunk)
 
     return pages
@@ -1,5 +1,7 @@
 # ingestion/metadata.py
 
+import re
+
 SECTION_KEYWORDS = {
     "introduction": ["introduction", "background"],
     "methods": ["method", "materials", "methodology"],
@@ -10,20 +12,120 @@ SECTION_KEYWORDS = {
 }
 
 
-def detect_section(text: str) -> str:
+def _heading_word(keyword: str) -> str:
+    """
+    "method" -> M(?i:ethod)\\w*: matches "Methods", "METHODOLOGY" but not
+    "methods" in running text, since headings start with a capital.
+    """
+    return re.escape(keyword[0].upper()) + "(?i:" + re.escape(keyword[1:]) + r")\w*"
+
+
+def _compile_headings() -> re.Pattern:
+    titles = "|".join(
+        f"(?P<{section}>" + "|".join(_heading_word(kw) for kw in keywords) + ")"
+        for section, keywords in SECTION_KEYWORDS.items()
+    )
+
+    # "4.", "4.2", "IV." style numbering
+    number = r"(?:\d{1,2}(?:\.\d{1,2})*\.?|[IVX]{1,4}\.)[ \t]+"
+
+    # Further heading words: capitalised, or short joiners ("and", "of")
+    word = r"(?:[A-Z][\w-]*|and|of|the|for|in|on|to|&)"
+
+    return re.compile(
+        # a whole line of raw page text, optionally numbered, ending with
+        # ":" / "." or a few more heading words; sentences never match
+        rf"^[ \t]*(?:{number})?(?:{titles})"
+        rf"(?:[:.]|(?:[ \t]+{word}){{0,5}}:?)[ \t]*$",
+        re.MULTILINE
+    )
+
+
+_HEADING = _compile_headings()
+
+
+def find_headings(raw_text: str) -> list:
+    """
+    Single scan for section headings on raw page text.
+
+    Headings are recognised as lines of their own, so this must run before
+    ingestion.parser.clean_text joins the lines. Offsets point into the
+    cleaned text (whitespace runs collapsed to single spaces), which is
+    what the rest of the pipeline sees.
+
+    Returns [(offset, section), ...] in text order.
+    """
+
+    headings = []
+    offset = 0
+    previous = 0
+    for m in _HEADING.finditer(raw_text):
+        # Matches start on a line, so no word straddles previous
+        words = raw_text[previous:m.start()].split()
+        offset += sum(len(w) for w in words) + len(words)
+        previous = m.start()
+        headings.append((offset, m.lastgroup))
+    return headings
+
+
+def label_sections(text: str, headings: list, current: str = "unknown") -> list:
+    """
+    Label the sections within one cleaned page.
+
+    headings come from find_headings on the page's raw text. current is
+    the section in effect when the page starts (carried over from the
+    previous page). Returns [(start, end, section), ...] covering the
+    whole text.
+    """
+
+    spans = []
+    start = 0
+
+    for offset, section in headings:
+        if offset > start:
+            spans.append((start, offset, current))
+        current = section
+        start = offset
+
+    spans.append((start, len(text), current))
+    return spans
+
+
+def section_at(spans: list, offset: int) -> str:
+    """Section of the label_sections span containing offset."""
+
+    for start, end, section in spans:
+        if start <= offset < end:
+            return section
+    return spans[-1][2]
+
+
+def iter_metadata(pages, paper_id: str):
     """
-    Heuristic section detection based on keyword presence.
-    Returns a section label or 'unknown'.
+    Streaming form of attach_metadata: yields one enriched page at a time.
+
+    Pages come from ingestion.parser.clean_page, which keeps the headings
+    found before cleaning. The section in effect at the end of each page
+    carries over to the next, so pages without a heading inherit the
+    running section. "sections" holds the page's label_sections spans, so
+    evidence can be labelled by where it occurs rather than by the
+    page's majority section.
     """
 
-    lowered = text.lower()
+    current = "unknown"
 
-    for section, keywords in SECTION_KEYWORDS.items():
-        for kw in keywords:
-            if kw in lowered:
-                return section
+    for page in pages:
+        spans = label_sections(page["text"], page.get("headings", []), current)
+        longest = max(spans, key=lambda span: span[1] - span[0])
+        current = spans[-1][2]
 
-    return "unknown"
+        yield {
+            "paper_id": paper_id,
+            "page_number": page["page_number"],
+            "section": longest[2],
+            "sections": spans,
+            "text": page["text"]
+        }
 
 
 def attach_metadata(pages: list, paper_id: str) -> list:
@@ -36,18 +138,9 @@ def attach_metadata(pages: list, paper_id: str) -> list:
             "paper_id": "Paper A",
             "page_number": int,
             "section": str,
+            "sections": [(start, end, section), ...],
             "text": str
         }
     ]
     """
-    enriched = []
-
-    for page in pages:
-        enriched.append({
-            "paper_id": paper_id,
-            "page_number": page["page_number"],
-            "section": detect_section(page["text"]),
-            "text": page["text"]
-        })
-
-    return enriched
+    return list(iter_metadata(pages, paper_id))
@@ -1,5 +1,8 @@
 # ingestion/parser.py
 
+from ingestion.metadata import find_headings
+
+
 def clean_text(raw_text: str) -> str:
     """
     Perform minimal text cleanup.
@@ -17,3 +20,25 @@ def clean_text(raw_text: str) -> str:
     text = " ".join(text.split())
 
     return text
+
+
+def clean_page(page: dict) -> dict:
+    """
+    Page with cleaned text plus the section headings found in its raw
+    lines (see ingestion.metadata.find_headings), which cleaning joins.
+    """
+
+    return {
+        **page,
+        "text": clean_text(page["text"]),
+        "headings": find_headings(page["text"] or ""),
+    }
+
+
+def iter_clean_pages(pages):
+    """
+    Yield pages with cleaned text, one at a time.
+    """
+
+    for page in pages:
+        yield clean_page(page)
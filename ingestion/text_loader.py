@@ -0,0 +1,74 @@
+# ingestion/text_loader.py
+
+import mmap
+from pathlib import Path
+
+from config.settings import TEXT_PAGE_LINES
+
+
+FORM_FEED = b"\f"
+NEWLINE = b"\n"
+
+
+def _page_bounds(mm, lines_per_page: int):
+    """
+    Yield (start, end) byte offsets of each pseudo-page.
+
+    Form feeds are treated as page breaks when the file has any; otherwise
+    the file is cut every lines_per_page lines. Only offsets are computed
+    here, the bytes stay in the mapping.
+    """
+
+    size = len(mm)
+    pos = 0
+
+    if mm.find(FORM_FEED) != -1:
+        while pos < size:
+            end = mm.find(FORM_FEED, pos)
+            if end == -1:
+                end = size
+            yield pos, end
+            pos = end + 1
+        return
+
+    while pos < size:
+        end = pos
+        for _ in range(lines_per_page):
+            end = mm.find(NEWLINE, end)
+            if end == -1:
+                end = size
+                break
+            end += 1
+        yield pos, end
+        pos = end
+
+
+def iter_text_pages(path: str, lines_per_page: int = TEXT_PAGE_LINES):
+    """
+    Yield page-level entries from a plain text paper via a memory map.
+
+    Same entry shape as ingestion.loader.load_pdf; only one page is
+    decoded into a Python string at a time.
+    """
+
+    with open(Path(path), "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # empty file: nothing to map
+
+        with mm:
+            for number, (start, end) in enumerate(_page_bounds(mm, lines_per_page), start=1):
+                text = mm[start:end].decode("utf-8", errors="replace")
+                yield {
+                    "page_number": number,
+                    "text": text.strip()
+                }
+
+
+def load_text(path: str, lines_per_page: int = TEXT_PAGE_LINES) -> list:
+    """
+    Load a plain text paper and return a list of page-level entries.
+    """
+
+    return list(iter_text_pages(path, lines_per_page))
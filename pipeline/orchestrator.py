@@ -2,61 +2,381 @@
 
 import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
-from ingestion.loader import load_pdf
-from ingestion.parser import clean_text
-from ingestion.metadata import attach_metadata
-from structuring.chunker import chunk_pages
+from config.settings import (
+    CHUNK_MAX_TOKENS,
+    CHUNK_OVERLAP_TOKENS,
+    CHUNK_STRATEGY,
+    CASCADE_ESCALATE_SCORE,
+    DEDUP_SIGNALS,
+    GATE_MIN_RECALL,
+    GATE_MODE,
+    INFERENCE_MAX_CALLS,
+    INFERENCE_MAX_SECONDS,
+    LLM_BACKEND,
+    LLM_BATCH_MAX_TOKENS,
+    LLM_BATCH_SIGNALS,
+    LLM_CACHE_MODE,
+    LLM_CONCURRENCY,
+    LLM_MAX_OUTPUT_TOKENS,
+    LLM_MODEL_TIERS,
+    LLM_OUTPUT_MODE,
+    LLM_PROMPT_LAYOUT,
+    LLM_STREAM,
+    LLM_TIMEOUT,
+    PDF_BACKEND,
+    PER_PAPER_QUOTA,
+    RUN_DEADLINE_SECONDS,
+    STRIP_BOILERPLATE,
+)
+from ingestion.cache import cache_key, clear_cache, load_cached, store_cached
+from ingestion.loader import extractor_version, iter_pdf_pages, load_pdf
+from ingestion.text_loader import iter_text_pages
+from ingestion.boilerplate import (
+    iter_strip_boilerplate_sampled,
+    new_report,
+    strip_boilerplate,
+)
+from ingestion.parser import clean_page, iter_clean_pages
+from ingestion.metadata import attach_metadata, iter_metadata
+from structuring.chunker import iter_budgeted_chunks, iter_chunks
 from evidence.signals import extract_signals
-from reasoning.extractor import extract_unanswered_questions
+from evidence.dedup import dedup_signals
+from reasoning.extractor import answer_signals, new_stats
+from reasoning.gate import make_gate
+from reasoning.llm_client import make_client
+from reasoning.response_cache import with_cache
+from pipeline.scheduler import schedule
+from contracts.output_schema import OPTIONAL_OUTPUT_FIELDS, OUTPUT_FIELDS
+from evaluation.baseline import simple_baseline_question
+
+
+def _is_text_paper(paper_path: str) -> bool:
+    return Path(paper_path).suffix.lower() == ".txt"
+
+
+def _iter_raw_pages(paper_path: str, options: dict):
+    if _is_text_paper(paper_path):
+        return iter_text_pages(paper_path)
+    return iter_pdf_pages(paper_path, backend=options["pdf_backend"])
+
+
+def _load_cleaned_pages(paper_path: str, options: dict) -> tuple:
+    """
+    Return (cleaned_pages, boilerplate_report), served from the ingestion
+    cache when the same file bytes were already processed by this extractor.
+
+    Plain text papers take the memory-mapped fast path; reading them is
+    cheaper than a cache lookup, so they are never cached.
+    """
+
+    is_text = _is_text_paper(paper_path)
+
+    key = None
+    if options["ingest_cache"] and not is_text:
+        version = extractor_version(options["pdf_backend"])
+        if options["strip_boilerplate"]:
+            version += "+boilerplate"
+        key = cache_key(paper_path, version)
+        cached = load_cached(key)
+        if cached is not None:
+            return cached["pages"], cached["boilerplate"]
+
+    if is_text:
+        pages = list(iter_text_pages(paper_path))
+    else:
+        pages = load_pdf(
+            paper_path,
+            workers=options["page_workers"],
+            backend=options["pdf_backend"]
+        )
+
+    report = new_report()
+    if options["strip_boilerplate"]:
+        pages, report = strip_boilerplate(pages)
+
+    cleaned = [clean_page(p) for p in pages]
+
+    if key is not None:
+        store_cached(key, {"pages": cleaned, "boilerplate": report})
+
+    return cleaned, report
+
+
+def _iter_chunks(enriched_pages, options: dict):
+    if options["chunking"] == "tokens":
+        return iter_budgeted_chunks(
+            enriched_pages,
+            max_tokens=options["chunk_tokens"],
+            overlap_tokens=options["chunk_overlap"]
+        )
+    return iter_chunks(enriched_pages)
+
+
+def _ingest_paper(job: tuple) -> dict:
+    """
+    Run the per-paper ingestion and signal stages.
+
+    Kept at module level so it can be shipped to worker processes.
+    """
+
+    paper_id, paper_path, options = job
+
+    if options["stream"]:
+        return _ingest_paper_streaming(paper_id, paper_path, options)
+
+    cleaned, report = _load_cleaned_pages(paper_path, options)
+    enriched = attach_metadata(cleaned, paper_id=paper_id)
+    chunks = _iter_chunks(enriched, options)
+
+    return {
+        "paper_id": paper_id,
+        "signals": extract_signals(chunks),
+        "boilerplate": report,
+    }
+
+
+def _ingest_paper_streaming(paper_id: str, paper_path: str, options: dict) -> dict:
+    """
+    Generator-chained ingestion: each page flows through cleaning, metadata
+    and chunking and is consumed by extract_signals before the next page is
+    extracted, so peak memory follows page size rather than document size.
+
+    The ingestion cache and page-range splitting both need the whole
+    document at once and are skipped in this mode. Boilerplate is learned
+    from a bounded sample of leading pages, so the document is still
+    extracted only once.
+    """
+
+    report = new_report()
+    pages = _iter_raw_pages(paper_path, options)
+
+    if options["strip_boilerplate"]:
+        pages = iter_strip_boilerplate_sampled(pages, report)
+
+    cleaned = iter_clean_pages(pages)
+    enriched = iter_metadata(cleaned, paper_id=paper_id)
+    chunks = _iter_chunks(enriched, options)
+
+    return {
+        "paper_id": paper_id,
+        "signals": extract_signals(chunks),
+        "boilerplate": report,
+    }
+
+
+def _ingest_all(papers: list, workers: int, options: dict) -> list:
+    """
+    Ingest every paper and return per-paper results in input order.
+
+    paper_id is assigned from the input position before fan-out, and
+    executor.map yields results in submission order, so the parallel
+    path produces exactly what the serial path does.
+    """
+
+    jobs = [
+        (f"Paper {chr(65 + idx)}", path, options)
+        for idx, path in enumerate(papers)
+    ]
+
+    if workers <= 1 or len(jobs) <= 1:
+        return [_ingest_paper(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+        return list(executor.map(_ingest_paper, jobs))
+
+
+_HEURISTIC_LABELS = {
+    "deadline": "deadline reached before the model could answer",
+    "model_error": "the model call failed",
+}
+
+
+def _heuristic_question(signal: dict, question_id: int, reason: str = "deadline") -> dict:
+    """
+    Question from evaluation.baseline for a signal the model could not
+    answer (reason: a key of _HEURISTIC_LABELS); marked so it is never
+    mistaken for model output.
+    """
+
+    text = simple_baseline_question(signal)
+    question = {
+        "question_id": question_id,
+        "paper_id": signal["paper_id"],
+        "page_number": signal["page_number"],
+        "signal_type": signal["signal_type"],
+        "signal_score": signal.get("signal_score", 0),
+        "content": text,
+        "question": text,
+        "heuristic": True,
+        "heuristic_reason": reason,
+    }
+    for key in ("span", "cluster_members"):
+        if key in signal:
+            question[key] = signal[key]
+    return question
+
+
+def _write_run_summary(summary: dict) -> None:
+    os.makedirs("outputs", exist_ok=True)
+    with open("outputs/run_summary.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
 
 
 def run(validated_input: dict) -> str:
+    started = time.monotonic()
+    deadline_seconds = validated_input.get("deadline", RUN_DEADLINE_SECONDS)
+    deadline = None if deadline_seconds is None else started + deadline_seconds
+
     papers = validated_input["papers"]
     max_questions = validated_input["max_questions"]
+    workers = validated_input.get("workers", 1)
+    ingest_options = {
+        "page_workers": validated_input.get("page_workers", 1),
+        "ingest_cache": validated_input.get("ingest_cache", True),
+        "stream": validated_input.get("stream", False),
+        "pdf_backend": validated_input.get("pdf_backend", PDF_BACKEND),
+        "strip_boilerplate": validated_input.get("strip_boilerplate", STRIP_BOILERPLATE),
+        "chunking": validated_input.get("chunking", CHUNK_STRATEGY),
+        "chunk_tokens": validated_input.get("chunk_tokens", CHUNK_MAX_TOKENS),
+        "chunk_overlap": validated_input.get("chunk_overlap", CHUNK_OVERLAP_TOKENS),
+    }
+
+    if validated_input.get("clear_ingest_cache", False):
+        clear_cache()
+
+    summary = {"papers": []}
+    all_signals = []
+
+    for paper in _ingest_all(papers, workers, ingest_options):
+        summary["papers"].append({
+            "paper_id": paper["paper_id"],
+            "boilerplate": paper["boilerplate"],
+            "signals": len(paper["signals"]),
+        })
+        all_signals.extend(paper["signals"])
+
+    # --- Collapse near-duplicate evidence before any LLM call ---
+    if validated_input.get("dedup", DEDUP_SIGNALS):
+        deduped = dedup_signals(all_signals)
+        summary["dedup"] = {
+            "signals_in": len(all_signals),
+            "signals_out": len(deduped),
+        }
+        all_signals = deduped
+
+    # --- Skip signals predicted to end in NO_VALID_QUESTION (at dispatch) ---
+    gate = make_gate(
+        validated_input.get("gate", GATE_MODE),
+        min_recall=validated_input.get("gate_recall", GATE_MIN_RECALL),
+    )
+    if gate is not None:
+        summary["gate"] = gate.stats
 
-    all_questions = []
+    # --- Spend the inference budget on the strongest evidence first ---
+    concurrency = validated_input.get("llm_concurrency", LLM_CONCURRENCY)
+    batch_signals = validated_input.get("llm_batch_signals", LLM_BATCH_SIGNALS)
+    batch_tokens = validated_input.get("llm_batch_tokens", LLM_BATCH_MAX_TOKENS)
+    client = make_client(
+        validated_input.get("llm_backend", LLM_BACKEND),
+        timeout=validated_input.get("llm_timeout", LLM_TIMEOUT),
+        concurrency=concurrency,
+        stream=validated_input.get("llm_stream", LLM_STREAM),
+    )
+    client = with_cache(client, validated_input.get("llm_cache", LLM_CACHE_MODE))
+    dispatched = {"count": 0}
+    summary["llm"] = new_stats()
+    if hasattr(client, "cache"):
+        summary["llm_cache"] = client.cache.stats
 
-    for idx, paper_path in enumerate(papers):
-        paper_id = f"Paper {chr(65 + idx)}"
+    def dispatch(batch):
+        start_id = dispatched["count"] + 1
+        failed = []
+        malformed = []
+        answers = answer_signals(
+            batch,
+            start_id=start_id,
+            client=client,
+            concurrency=concurrency,
+            batch_signals=batch_signals,
+            batch_tokens=batch_tokens,
+            max_output_tokens=validated_input.get("llm_max_output_tokens", LLM_MAX_OUTPUT_TOKENS),
+            layout=validated_input.get("prompt_layout", LLM_PROMPT_LAYOUT),
+            output=validated_input.get("llm_output", LLM_OUTPUT_MODE),
+            models=validated_input.get("llm_models", LLM_MODEL_TIERS),
+            escalate_score=validated_input.get("escalate_score", CASCADE_ESCALATE_SCORE),
+            stats=summary["llm"],
+            deadline=deadline,
+            failed=failed,
+            malformed=malformed
+        )
+        dispatched["count"] += len(batch)
 
-        pages = load_pdf(paper_path)
-        cleaned = [{**p, "text": clean_text(p["text"])} for p in pages]
-        enriched = attach_metadata(cleaned, paper_id=paper_id)
-        chunks = chunk_pages(enriched)
+        # A failed call degrades to the heuristic question for that signal
+        for position in failed:
+            answers[position] = _heuristic_question(
+                batch[position], start_id + position, reason="model_error"
+            )
 
-        signals = extract_signals(chunks)
+        # Only real answers and refusals are outcomes the gate can learn from
+        if gate is not None:
+            for position, (signal, answer) in enumerate(zip(batch, answers)):
+                if position not in failed and position not in malformed:
+                    gate.record(signal, refused=answer is None)
+        return answers
 
-        # 🔒 TEMP SAFETY CAP (CPU-safe; remove later if needed)
-        signals = signals[:1]
+    def fallback(signal):
+        dispatched["count"] += 1
+        return _heuristic_question(signal, dispatched["count"])
 
-        questions = extract_unanswered_questions(signals)
-        all_questions.extend(questions)
+    try:
+        all_questions, summary["scheduler"] = schedule(
+            all_signals,
+            dispatch,
+            max_questions=max_questions,
+            max_calls=validated_input.get("max_llm_calls", INFERENCE_MAX_CALLS),
+            max_seconds=validated_input.get("llm_time_budget", INFERENCE_MAX_SECONDS),
+            per_paper_quota=validated_input.get("per_paper_quota", PER_PAPER_QUOTA),
+            batch_size=concurrency * batch_signals,
+            deadline=deadline,
+            fallback=fallback,
+            admit=None if gate is None else gate.admit,
+        )
+    finally:
+        client.close()
+        if gate is not None:
+            gate.close()
 
     # --- v1: rank questions by evidence strength ---
+    # (model answers before heuristic fallbacks)
     all_questions.sort(
-        key=lambda q: q.get("signal_score", 0),
+        key=lambda q: (not q.get("heuristic"), q.get("signal_score", 0)),
         reverse=True
     )
 
     # Enforce max_questions AFTER ranking
     all_questions = all_questions[:max_questions]
 
+    _write_run_summary(summary)
+
     if not all_questions:
         return "No strong unanswered questions detected from the provided papers."
 
     # --- Save structured JSON output for evaluation ---
     os.makedirs("outputs", exist_ok=True)
 
+    # Fields follow contracts.output_schema; QUESTION/WHY/MISSING stay separate
     structured_output = []
     for q in all_questions:
-        structured_output.append({
-            "paper_id": q["paper_id"],
-            "page_number": q["page_number"],
-            "signal_type": q["signal_type"],
-            "signal_score": q.get("signal_score", 0),
-            "question": q["content"],
-        })
+        record = {field: q.get(field, "") for field in OUTPUT_FIELDS}
+        record["signal_score"] = q.get("signal_score", 0)
+        for key in OPTIONAL_OUTPUT_FIELDS:
+            if key in q:
+                record[key] = q[key]
+        structured_output.append(record)
 
     with open("outputs/latest_results.json", "w", encoding="utf-8") as f:
         json.dump(structured_output, f, indent=2)
@@ -64,12 +384,26 @@ def run(validated_input: dict) -> str:
     # --- Human-readable CLI output ---
     blocks = []
     for q in all_questions:
+        pages = f"page {q['page_number']}"
+        span = q.get("span")
+        if span and span["page_end"] != span["page_start"]:
+            pages = f"pages {span['page_start']}–{span['page_end']}"
+
         block = f"""
 {q['content']}
 
 Source:
-{q['paper_id']} — page {q['page_number']} ({q['signal_type']})
+{q['paper_id']} — {pages} ({q['signal_type']})
 """.strip()
+
+        if q.get("heuristic"):
+            reason = _HEURISTIC_LABELS[q.get("heuristic_reason", "deadline")]
+            block += f"\n[heuristic: {reason}]"
+
+        members = q.get("cluster_members", [])
+        if members:
+            also = ", ".join(f"{m['paper_id']} p.{m['page_number']}" for m in members)
+            block += f"\nAlso found in: {also}"
         blocks.append(block)
 
     return "\n\n".join(blocks)
@@ -0,0 +1,148 @@
+# pipeline/scheduler.py
+
+import heapq
+import time
+
+
+def schedule(
+    signals: list,
+    dispatch,
+    max_questions: int,
+    max_calls: int = None,
+    max_seconds: float = None,
+    per_paper_quota: int = None,
+    batch_size: int = 1,
+    deadline: float = None,
+    fallback=None,
+    admit=None
+) -> tuple:
+    """
+    Spend the inference budget on the strongest evidence across all papers.
+
+    Signals are popped from a max-heap on signal_score (ties keep input
+    order) and handed to dispatch in batches of up to batch_size.
+    dispatch(batch) must return one question dict, or None for a refusal,
+    per signal. Questions marked "heuristic" (fallbacks for failed calls)
+    are kept but counted as fallback, not accepted, so they never end
+    dispatching in place of model answers.
+
+    Dispatching stops when:
+    - max_questions model answers have been accepted,
+    - max_calls signals have been dispatched,
+    - max_seconds of wall-clock time have been spent,
+    - the next batch is predicted to finish after deadline, or
+    - no signals are left.
+
+    per_paper_quota caps how many signals of one paper are dispatched,
+    so a single verbose paper cannot take the whole budget.
+
+    admit(signal), when given, is asked about each signal as it is taken
+    for dispatch; signals it rejects are dropped without using the call
+    budget or the paper's quota (see reasoning.gate.RefusalGate.admit).
+
+    deadline is a time.monotonic() timestamp. The next batch is predicted
+    to take as long as recent batches did (exponentially weighted); the
+    first batch is only skipped if the deadline has already passed. When
+    dispatching stops for the deadline, fallback(signal) turns the
+    remaining strongest signals into questions until max_questions is
+    reached.
+
+    Returns (questions, stats).
+    """
+
+    heap = [
+        (-signal.get("signal_score", 0), order, signal)
+        for order, signal in enumerate(signals)
+    ]
+    heapq.heapify(heap)
+
+    questions = []
+    per_paper = {}
+    stats = {
+        "candidates": len(signals),
+        "dispatched": 0,
+        "accepted": 0,
+        "skipped_quota": 0,
+        "skipped_admit": 0,
+        "fallback": 0,
+        "stop_reason": "exhausted",
+    }
+    batch_seconds = None  # weighted average of recent batch durations
+
+    start = time.monotonic()
+
+    while heap:
+        if len(questions) - stats["fallback"] >= max_questions:
+            stats["stop_reason"] = "max_questions"
+            break
+        if max_calls is not None and stats["dispatched"] >= max_calls:
+            stats["stop_reason"] = "max_calls"
+            break
+        if max_seconds is not None and time.monotonic() - start >= max_seconds:
+            stats["stop_reason"] = "max_seconds"
+            break
+        if deadline is not None and time.monotonic() + (batch_seconds or 0) > deadline:
+            stats["stop_reason"] = "deadline"
+            break
+
+        limit = batch_size
+        if max_calls is not None:
+            limit = min(limit, max_calls - stats["dispatched"])
+
+        batch = _take(heap, limit, per_paper, per_paper_quota, stats, admit)
+        if not batch:
+            break
+
+        batch_start = time.monotonic()
+        results = dispatch(batch)
+        elapsed = time.monotonic() - batch_start
+        batch_seconds = elapsed if batch_seconds is None else 0.5 * batch_seconds + 0.5 * elapsed
+        stats["dispatched"] += len(batch)
+
+        for question in results:
+            if question is not None:
+                questions.append(question)
+                stats["fallback"] += bool(question.get("heuristic"))
+
+    if stats["stop_reason"] == "deadline" and fallback is not None:
+        while len(questions) < max_questions:
+            signals_left = _take(heap, 1, per_paper, per_paper_quota, stats)
+            if not signals_left:
+                break
+            questions.append(fallback(signals_left[0]))
+            stats["fallback"] += 1
+
+    stats["accepted"] = len(questions) - stats["fallback"]
+    if batch_seconds is not None:
+        stats["batch_seconds"] = round(batch_seconds, 3)
+    stats["seconds"] = round(time.monotonic() - start, 3)
+
+    return questions, stats
+
+
+def _take(
+    heap: list,
+    limit: int,
+    per_paper: dict,
+    per_paper_quota: int,
+    stats: dict,
+    admit=None
+) -> list:
+    """
+    Pop up to limit signals, skipping papers that used up their quota and
+    signals admit rejects.
+    """
+
+    batch = []
+    while heap and len(batch) < limit:
+        _, _, signal = heapq.heappop(heap)
+        paper_id = signal["paper_id"]
+        if per_paper_quota is not None and per_paper.get(paper_id, 0) >= per_paper_quota:
+            stats["skipped_quota"] += 1
+            continue
+        if admit is not None and not admit(signal):
+            stats["skipped_admit"] += 1
+            continue
+        per_paper[paper_id] = per_paper.get(paper_id, 0) + 1
+        batch.append(signal)
+    return batch
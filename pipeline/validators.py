@@ -0,0 +1,36 @@
+# pipeline/validators.py
+
+import re
+
+from reasoning.response_parser import REFUSAL, is_well_formed
+
+
+# A sentence end followed by the start of another sentence
+_SENTENCE_BREAK = re.compile(r"[.?!]\s+[A-Z]")
+
+
+def answer_problem(response: str):
+    """
+    Structural check of one model answer.
+
+    Returns None when the answer is usable (a refusal, or QUESTION, WHY
+    and MISSING lines with a single-sentence question), otherwise a short
+    reason.
+    """
+
+    response = response.strip()
+    if response == REFUSAL:
+        return None
+
+    if not is_well_formed(response):
+        return "missing_fields"
+
+    question = next(
+        line for line in response.splitlines()
+        if line.strip().startswith("QUESTION:")
+    )
+    question = question.split(":", 1)[1].strip()
+    if _SENTENCE_BREAK.search(question):
+        return "multi_sentence_question"
+
+    return None
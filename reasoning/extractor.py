@@ -1,10 +1,349 @@
 # reasoning/extractor.py
 
-from reasoning.prompt_builder import build_unanswered_question_prompt
-from reasoning.llm_client import call_ollama
+import asyncio
+import time
 
+from config.settings import (
+    CASCADE_ESCALATE_SCORE,
+    LLM_BATCH_MAX_TOKENS,
+    LLM_BATCH_SIGNALS,
+    LLM_CONCURRENCY,
+    LLM_MAX_OUTPUT_TOKENS,
+    LLM_MODEL,
+    LLM_OUTPUT_MODE,
+    LLM_PROMPT_LAYOUT,
+)
+from contracts.output_schema import ANSWER_SCHEMA, BATCH_ANSWER_SCHEMA
+from reasoning.prompt_builder import build_prompt, pack_signals
+from reasoning.llm_client import LLMClientError, generate
+from reasoning.response_parser import (
+    answer_fields,
+    is_well_formed,
+    parse_json_answer,
+    parse_json_answers,
+    parse_numbered_answers,
+)
+from pipeline.validators import answer_problem
 
-def extract_unanswered_questions(signals: list, model: str = "phi3:mini") -> list:
+
+def _to_question(signal: dict, response: str, question_id: int):
+    """
+    Turn a model response into a question record, or None on refusal.
+    """
+
+    cleaned_response = response.strip()
+
+    if cleaned_response == "NO_VALID_QUESTION":
+        return None
+
+    question = {
+        "question_id": question_id,
+        "paper_id": signal["paper_id"],
+        "page_number": signal["page_number"],
+        "signal_type": signal["signal_type"],
+        "signal_score": signal.get("signal_score", 0),  # 🔥 FIXED
+        "content": cleaned_response,
+        **answer_fields(cleaned_response),
+    }
+
+    # Provenance from chunking and deduplication
+    for key in ("span", "cluster_members"):
+        if key in signal:
+            question[key] = signal[key]
+
+    return question
+
+
+def _bump(counter: dict, key: str) -> None:
+    counter[key] = counter.get(key, 0) + 1
+
+
+def new_stats() -> dict:
+    return {
+        "prompts": 0,
+        "cached": 0,
+        "batched_signals": 0,
+        "fallbacks": 0,
+        "early_stops": 0,
+        "invalid_json": 0,
+        "malformed": 0,
+        "model_errors": 0,
+        "prefill_saved_seconds": 0.0,
+        "escalations": {},
+        "tiers": {},
+        "calls": [],
+    }
+
+
+async def answer_signals_async(
+    signals: list,
+    model: str = LLM_MODEL,
+    start_id: int = 1,
+    client=None,
+    concurrency: int = LLM_CONCURRENCY,
+    batch_signals: int = LLM_BATCH_SIGNALS,
+    batch_tokens: int = LLM_BATCH_MAX_TOKENS,
+    max_output_tokens: int = LLM_MAX_OUTPUT_TOKENS,
+    layout: str = LLM_PROMPT_LAYOUT,
+    output: str = LLM_OUTPUT_MODE,
+    models: list = None,
+    escalate_score: int = CASCADE_ESCALATE_SCORE,
+    stats: dict = None,
+    deadline: float = None,
+    failed: list = None,
+    malformed: list = None
+) -> list:
+    """
+    Ask the model about each signal with up to `concurrency` calls in flight.
+
+    Signals are packed into prompts of up to batch_signals numbered
+    evidence blocks (see reasoning.prompt_builder.pack_signals). Batches
+    flow through a bounded queue to a fixed set of workers; each blocking
+    client call runs in a worker thread. Any block whose answer cannot be
+    parsed from a batched response is asked again on its own.
+
+    models is a cascade of model tiers, smallest first (default: just
+    model). Signals start on the first tier, or on the last one when
+    their signal_score reaches escalate_score; an answer that fails
+    pipeline.validators.answer_problem is asked again on the next tier.
+    An answer that is still not well formed after the last tier (see
+    reasoning.response_parser.is_well_formed; in JSON mode, also one that
+    did not parse) is dropped: its position is appended to malformed,
+    when given, and counted.
+
+    Answers are written back by position, so the result order (and
+    question_id) matches the input order regardless of completion order.
+    Each prompt may generate max_output_tokens per signal it covers and
+    stops as soon as all of its answers are complete. layout and output
+    are passed to reasoning.prompt_builder.build_prompt; with output
+    "json" decoding is constrained to the schemas in
+    contracts.output_schema and answers are parsed from JSON.
+
+    stats, when given, counts prompts sent to the model, prompts answered
+    from the response cache (kept out of the prompt and tier counts),
+    signals answered from batched prompts, single-signal fallbacks, early
+    stops, prefill time saved by prefix reuse, escalations by reason, and
+    calls and seconds per tier, and collects each call's timing metrics
+    (see reasoning.llm_client).
+
+    deadline (a time.monotonic() timestamp) bounds every call, retries
+    included. A signal whose call fails with a transient LLMClientError
+    (retryable, or cut short by the deadline) gets no answer: its position
+    is appended to failed, when given, and counted as a model error
+    instead of ending the run. A failed batched call falls back to asking
+    each signal on its own. Any other LLMClientError (missing model,
+    runtime not installed) is raised, since no later call could succeed.
+    """
+
+    tiers = list(models or [model])
+    answers = [None] * len(signals)
+    pending = asyncio.Queue(maxsize=concurrency * 2)
+    stats = new_stats() if stats is None else stats
+    for tier_model in tiers:
+        stats["tiers"].setdefault(tier_model, {"calls": 0, "seconds": 0.0})
+
+    async def ask(group, tier_model):
+        system, prompt = build_prompt(group, layout, output)
+        options = {"max_tokens": max_output_tokens * len(group)}
+        if output == "json":
+            options["format"] = ANSWER_SCHEMA if len(group) == 1 else BATCH_ANSWER_SCHEMA
+        else:
+            options["stop_answers"] = len(group)
+        if system:
+            options["system"] = system
+
+        def count_call():
+            stats["prompts"] += 1
+            tier = stats["tiers"][tier_model]
+            tier["calls"] += 1
+            tier["seconds"] = round(tier["seconds"] + time.monotonic() - start, 3)
+
+        start = time.monotonic()
+        try:
+            result = await asyncio.to_thread(
+                generate, prompt, tier_model, client, deadline=deadline, **options
+            )
+        except LLMClientError:
+            count_call()
+            raise
+
+        if result.get("cached"):
+            stats["cached"] += 1
+        else:
+            count_call()
+
+        metrics = result.get("metrics")
+        if metrics:
+            stats["calls"].append({"model": tier_model, **metrics})
+            stats["early_stops"] += metrics["stopped_early"]
+            stats["prefill_saved_seconds"] = round(
+                stats["prefill_saved_seconds"] + metrics.get("prefill_saved_seconds", 0.0), 3
+            )
+
+        response = result["response"].strip()
+        if output == "json" and len(group) == 1:
+            # Unparseable JSON counts as an empty, malformed answer
+            parsed = parse_json_answer(response)
+            if parsed is None:
+                _bump(stats, "invalid_json")
+            response = parsed or ""
+        return response
+
+    def survivable(error: LLMClientError) -> bool:
+        if error.retryable:
+            return True
+        return deadline is not None and time.monotonic() >= deadline
+
+    async def ask_single(signal, tier_model):
+        """ask for one signal; None when the call failed transiently."""
+
+        try:
+            return await ask([signal], tier_model)
+        except LLMClientError as e:
+            if not survivable(e):
+                raise
+            stats["model_errors"] += 1
+            return None
+
+    async def answer_group(group, tier):
+        """One response per signal of group from tiers[tier] (None: failed)."""
+
+        parsed = {}
+        if len(group) > 1:
+            try:
+                response = await ask(group, tiers[tier])
+            except LLMClientError as e:
+                if not survivable(e):
+                    raise
+                stats["model_errors"] += 1
+            else:
+                if output == "json":
+                    parsed = parse_json_answers(response, len(group))
+                else:
+                    parsed = parse_numbered_answers(response, len(group))
+                stats["batched_signals"] += len(parsed)
+
+        responses = []
+        for number, signal in enumerate(group, start=1):
+            response = parsed.get(number)
+            if response is None:
+                if len(group) > 1:
+                    stats["fallbacks"] += 1
+                response = await ask_single(signal, tiers[tier])
+            responses.append(response)
+        return responses
+
+    async def answer_cascade(positions, group, tier):
+        responses = await answer_group(group, tier)
+
+        for position, signal, response in zip(positions, group, responses):
+            level = tier
+            while response is not None and level + 1 < len(tiers):
+                problem = answer_problem(response)
+                if problem is None:
+                    break
+                _bump(stats["escalations"], problem)
+                level += 1
+                response = await ask_single(signal, tiers[level])
+
+            if response is None:
+                if failed is not None:
+                    failed.append(position)
+                continue
+            if not is_well_formed(response):
+                stats["malformed"] += 1
+                if malformed is not None:
+                    malformed.append(position)
+                continue
+            answers[position] = _to_question(signal, response, start_id + position)
+
+    async def produce():
+        for batch in pack_signals(signals, batch_signals, batch_tokens):
+            await pending.put(batch)
+        for _ in range(concurrency):
+            await pending.put(None)  # one stop marker per worker
+
+    async def work():
+        while True:
+            item = await pending.get()
+            if item is None:
+                return
+            positions, group = item
+
+            routes = {}
+            for position, signal in zip(positions, group):
+                tier = 0
+                if (
+                    len(tiers) > 1
+                    and escalate_score is not None
+                    and signal.get("signal_score", 0) >= escalate_score
+                ):
+                    tier = len(tiers) - 1
+                    _bump(stats["escalations"], "high_score")
+                tier_positions, tier_group = routes.setdefault(tier, ([], []))
+                tier_positions.append(position)
+                tier_group.append(signal)
+
+            for tier, (tier_positions, tier_group) in sorted(routes.items()):
+                await answer_cascade(tier_positions, tier_group, tier)
+
+    await asyncio.gather(produce(), *(work() for _ in range(concurrency)))
+    return answers
+
+
+def answer_signals(
+    signals: list,
+    model: str = LLM_MODEL,
+    start_id: int = 1,
+    client=None,
+    concurrency: int = LLM_CONCURRENCY,
+    batch_signals: int = LLM_BATCH_SIGNALS,
+    batch_tokens: int = LLM_BATCH_MAX_TOKENS,
+    max_output_tokens: int = LLM_MAX_OUTPUT_TOKENS,
+    layout: str = LLM_PROMPT_LAYOUT,
+    output: str = LLM_OUTPUT_MODE,
+    models: list = None,
+    escalate_score: int = CASCADE_ESCALATE_SCORE,
+    stats: dict = None,
+    deadline: float = None,
+    failed: list = None,
+    malformed: list = None
+) -> list:
+    """
+    Ask the model about each signal.
+
+    Returns one entry per signal, in order: a question dict, or None when
+    the model refused, the call failed or the answer was malformed (see
+    failed and malformed in answer_signals_async). question_id counts from start_id by position.
+    client is a reasoning.llm_client client; the default one when omitted.
+    """
+
+    if not signals:
+        return []
+
+    return asyncio.run(answer_signals_async(
+        signals, model, start_id, client,
+        concurrency=concurrency,
+        batch_signals=batch_signals,
+        batch_tokens=batch_tokens,
+        max_output_tokens=max_output_tokens,
+        layout=layout,
+        output=output,
+        models=models,
+        escalate_score=escalate_score,
+        stats=stats,
+        deadline=deadline,
+        failed=failed,
+        malformed=malformed
+    ))
+
+
+def extract_unanswered_questions(
+    signals: list,
+    model: str = LLM_MODEL,
+    client=None,
+    models: list = None
+) -> list:
     """
     Extract exactly one unanswered question per signal.
 
@@ -15,24 +354,5 @@ def extract_unanswered_questions(signals: list, model: str = "phi3:mini") -> lis
     - signal_score (for ranking in v1+)
     """
 
-    questions = []
-
-    for idx, signal in enumerate(signals, start=1):
-        prompt = build_unanswered_question_prompt(signal)
-        response = call_ollama(prompt, model=model)
-
-        cleaned_response = response.strip()
-
-        if cleaned_response == "NO_VALID_QUESTION":
-            continue
-
-        questions.append({
-            "question_id": idx,
-            "paper_id": signal["paper_id"],
-            "page_number": signal["page_number"],
-            "signal_type": signal["signal_type"],
-            "signal_score": signal.get("signal_score", 0),  # 🔥 FIXED
-            "content": cleaned_response
-        })
-
-    return questions
+    answers = answer_signals(signals, model=model, client=client, models=models)
+    return [q for q in answers if q is not None]
@@ -0,0 +1,270 @@
+# reasoning/gate.py
+
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter
+
+from config.settings import (
+    GATE_AUDIT_RATE,
+    GATE_LOG_MAX_ROWS,
+    GATE_LOG_PATH,
+    GATE_MIN_EXAMPLES,
+    GATE_MIN_RECALL,
+    GATE_MIN_WORDS,
+    GATE_MODE,
+)
+from evidence.signals import MIN_SIGNAL_SCORE
+
+
+GATE_MODES = ("on", "log", "off")
+
+# Hedges that alone rarely support a specific research question
+_MODAL_PATTERNS = {"may ", "might ", "could "}
+
+_WORD = re.compile(r"[a-z]{3,}")
+
+
+def signal_features(signal: dict) -> set:
+    """Bag of features for the refusal classifier."""
+
+    features = {f"w:{w}" for w in _WORD.findall(signal.get("text_excerpt", "").lower())}
+    features.add(f"type:{signal.get('signal_type')}")
+    features.add(f"section:{signal.get('section', 'unknown')}")
+    features.add(f"score:{signal.get('signal_score', 0)}")
+    features.update(f"pattern:{p}" for p in signal.get("matched_patterns", []))
+    return features
+
+
+def rule_skip(signal: dict) -> bool:
+    """
+    Cold-start cascade used until enough outcomes are logged:
+    - excerpts too short to carry a question,
+    - uncertainty signals at the minimum score whose only evidence is
+      a modal verb.
+    """
+
+    if len(signal.get("text_excerpt", "").split()) < GATE_MIN_WORDS:
+        return True
+
+    patterns = set(signal.get("matched_patterns", []))
+    return (
+        signal.get("signal_type") == "uncertainty"
+        and signal.get("signal_score", 0) <= MIN_SIGNAL_SCORE
+        and patterns <= _MODAL_PATTERNS
+    )
+
+
+def load_outcomes(path: str = GATE_LOG_PATH, max_rows: int = GATE_LOG_MAX_ROWS) -> list:
+    """
+    Read logged (features, refused) outcomes, newest max_rows only.
+    Repeated evidence keeps its latest outcome.
+
+    The log is rewritten with just those rows once it has grown to more
+    than twice max_rows lines.
+    """
+
+    if not os.path.exists(path):
+        return []
+
+    latest = {}
+    lines = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            lines += 1
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            latest.pop(row["key"], None)
+            latest[row["key"]] = row
+
+    rows = list(latest.values())[-max_rows:]
+
+    if lines > 2 * max_rows:
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(row) + "\n" for row in rows)
+        os.replace(tmp, path)
+
+    return rows
+
+
+def train(outcomes: list) -> dict:
+    """
+    Naive Bayes over the features present in each signal (set-of-words:
+    absent features contribute nothing), with add-one smoothing.
+    Returns None until both outcomes have been seen often enough.
+    """
+
+    refused = [set(r["features"]) for r in outcomes if r["refused"]]
+    answered = [set(r["features"]) for r in outcomes if not r["refused"]]
+
+    if len(outcomes) < GATE_MIN_EXAMPLES or not refused or not answered:
+        return None
+
+    counts = {True: Counter(), False: Counter()}
+    for label, rows in ((True, refused), (False, answered)):
+        for features in rows:
+            counts[label].update(features)
+
+    n_refused, n_answered = len(refused), len(answered)
+    weights = {}
+    for feature in counts[True].keys() | counts[False].keys():
+        p_r = (counts[True][feature] + 1) / (n_refused + 2)
+        p_a = (counts[False][feature] + 1) / (n_answered + 2)
+        weights[feature] = math.log(p_r / p_a)
+
+    return {
+        "prior": math.log(n_refused / n_answered),
+        "weights": weights,
+    }
+
+
+def refusal_probability(model: dict, features: set) -> float:
+    log_odds = model["prior"] + sum(model["weights"].get(f, 0.0) for f in features)
+    log_odds = max(-50.0, min(50.0, log_odds))
+    return 1 / (1 + math.exp(-log_odds))
+
+
+def recall_threshold(model: dict, outcomes: list, min_recall: float) -> float:
+    """
+    Refusal probability above which signals are skipped, chosen so that
+    at least min_recall of the logged answered signals would still be
+    sent. Never below 0.5.
+    """
+
+    answered = sorted(
+        refusal_probability(model, set(r["features"]))
+        for r in outcomes if not r["refused"]
+    )
+    keep = min(len(answered), math.ceil(min_recall * len(answered)))
+    threshold = answered[keep - 1] if keep else 0.0
+    return max(0.5, threshold)
+
+
+def _evidence_key(signal: dict) -> str:
+    text = f"{signal.get('signal_type')}\0{signal.get('text_excerpt', '')}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class RefusalGate:
+    """
+    Predicts NO_VALID_QUESTION before the model is called.
+
+    Every model outcome is appended to a JSONL log. Once the log holds
+    GATE_MIN_EXAMPLES outcomes of both kinds, a naive Bayes classifier
+    trained on it replaces the cold-start rules; its skip threshold is set
+    so that min_recall of the signals the model did answer would still
+    be sent.
+
+    In "on" mode predicted refusals are dropped, except for a sample of
+    audit_rate of them that is sent anyway to measure how often the gate
+    and the model disagree. In "log" mode nothing is skipped, so every
+    predicted refusal is audited.
+    """
+
+    def __init__(
+        self,
+        mode: str = GATE_MODE,
+        log_path: str = GATE_LOG_PATH,
+        min_recall: float = GATE_MIN_RECALL,
+        audit_rate: float = GATE_AUDIT_RATE
+    ):
+        if mode not in GATE_MODES:
+            raise ValueError(f"Unknown gate mode: {mode}")
+
+        self.mode = mode
+        self.log_path = log_path
+        self.audit_every = round(1 / audit_rate) if audit_rate else 0
+
+        outcomes = load_outcomes(log_path)
+        self.model = train(outcomes)
+        self.threshold = None
+        if self.model is not None:
+            self.threshold = recall_threshold(self.model, outcomes, min_recall)
+
+        self._predicted = {}
+        self._audited = set()
+        self._log = None
+        self.stats = {
+            "mode": mode,
+            "predictor": "rules" if self.model is None else "classifier",
+            "threshold": None if self.threshold is None else round(self.threshold, 4),
+            "training_examples": len(outcomes),
+            "checked": 0,
+            "predicted_refusals": 0,
+            "skipped": 0,
+            "audited": 0,
+            "audit_disagreed": 0,
+            "passed_refused": 0,
+            "skip_rate": 0.0,
+        }
+
+    def predicts_refusal(self, signal: dict) -> bool:
+        if self.model is None:
+            return rule_skip(signal)
+        p = refusal_probability(self.model, signal_features(signal))
+        return p > self.threshold
+
+    def admit(self, signal: dict) -> bool:
+        """
+        True if signal should still go to the model. Called for signals
+        about to be dispatched, so the stats only cover those.
+        """
+
+        self.stats["checked"] += 1
+        predicted = self.predicts_refusal(signal)
+        self._predicted[id(signal)] = predicted
+        admitted = True
+
+        if predicted:
+            self.stats["predicted_refusals"] += 1
+            if self.mode == "log":
+                self._audited.add(id(signal))  # nothing is skipped
+            elif (
+                self.audit_every
+                and self.stats["predicted_refusals"] % self.audit_every == 0
+            ):
+                self._audited.add(id(signal))
+            else:
+                self.stats["skipped"] += 1
+                admitted = False
+
+        self.stats["skip_rate"] = round(self.stats["skipped"] / self.stats["checked"], 4)
+        return admitted
+
+    def record(self, signal: dict, refused: bool) -> None:
+        """Log the model's outcome for a signal that passed the gate."""
+
+        predicted = self._predicted.get(id(signal))
+        if id(signal) in self._audited:
+            self.stats["audited"] += 1
+            self.stats["audit_disagreed"] += not refused
+        elif predicted is False and refused:
+            self.stats["passed_refused"] += 1
+
+        if self._log is None:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            self._log = open(self.log_path, "a", encoding="utf-8")
+
+        self._log.write(json.dumps({
+            "key": _evidence_key(signal),
+            "features": sorted(signal_features(signal)),
+            "refused": refused,
+        }) + "\n")
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+
+def make_gate(mode: str = GATE_MODE, min_recall: float = GATE_MIN_RECALL):
+    """RefusalGate for mode, or None when gating is off."""
+
+    if mode == "off":
+        return None
+    return RefusalGate(mode, min_recall=min_recall)
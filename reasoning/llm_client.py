@@ -1,19 +1,568 @@
 # reasoning/llm_client.py
 
+import http.client
+import json
+import os
+import queue
+import socket
 import subprocess
+import time
+from urllib.parse import urlsplit
 
+from config.settings import (
+    LLM_BACKEND,
+    LLM_MODEL,
+    LLM_POOL_SIZE,
+    LLM_RETRIES,
+    LLM_RETRY_BACKOFF,
+    LLM_STREAM,
+    LLM_TIMEOUT,
+    OLLAMA_KEEP_ALIVE,
+    OLLAMA_URL,
+)
+from reasoning.response_parser import REFUSAL as _REFUSAL, completed_answers
+from structuring.tokens import estimate_tokens
 
-def call_ollama(prompt: str, model: str = "phi3:mini") -> str:
+
+class LLMClientError(Exception):
+    """
+    retryable marks transient failures (timeouts, dropped connections,
+    server errors) that generate() retries with backoff.
     """
-    Windows-safe, CPU-safe Ollama call.
+
+    def __init__(self, message: str, retryable: bool = False):
+        self.message = message
+        self.retryable = retryable
+        super().__init__(message)
+
+
+class OllamaCLIClient:
+    """
+    Windows-safe, CPU-safe Ollama call through `ollama run`.
     Explicitly encodes stdin and decodes stdout.
+
+    Starts one process per prompt; kept for environments where the HTTP
+    API is not reachable.
     """
 
-    process = subprocess.run(
-        ["ollama", "run", model],
-        input=prompt.encode("utf-8"),   # 🔑 FIX: encode stdin
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-    )
+    def __init__(self, timeout: float = LLM_TIMEOUT):
+        self.timeout = timeout
+
+    def generate(
+        self,
+        prompt: str,
+        model: str = LLM_MODEL,
+        max_tokens: int = None,
+        stop_answers: int = None,
+        system: str = None,
+        format: dict = None,
+        timeout: float = None
+    ) -> dict:
+        """
+        timeout overrides the client's timeout for this call.
+
+        max_tokens and stop_answers are accepted for interface parity but
+        cannot be enforced through `ollama run`; system is prepended to
+        the prompt. A format schema is reduced to plain JSON mode, which
+        is all the CLI offers.
+        """
+
+        if system:
+            prompt = f"{system}\n\n{prompt}"
+
+        command = ["ollama", "run", model]
+        if format is not None:
+            command += ["--format", "json"]
+
+        timeout = timeout or self.timeout
+
+        start = time.monotonic()
+        try:
+            process = subprocess.run(
+                command,
+                input=prompt.encode("utf-8"),   # 🔑 FIX: encode stdin
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=timeout,
+            )
+        except FileNotFoundError:
+            raise LLMClientError("ollama executable not found on PATH")
+        except subprocess.TimeoutExpired:
+            raise LLMClientError(f"ollama run timed out after {timeout:.1f}s", retryable=True)
+
+        if process.returncode != 0:
+            stderr = process.stderr.decode("utf-8", errors="ignore").strip()
+            raise LLMClientError(f"ollama run failed ({process.returncode}): {stderr}")
+
+        return {
+            "response": process.stdout.decode("utf-8", errors="ignore").strip(),
+            "metrics": _call_metrics({}, start, None, 0, False),
+        }
+
+    def model_digest(self, model: str = LLM_MODEL):
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class OllamaHTTPClient:
+    """
+    Client for the local Ollama HTTP API with pooled keep-alive connections.
+
+    Connections are reused across calls (and threads, via the pool), and
+    every request sets keep_alive so the model stays resident between
+    signals instead of being reloaded. With stream=True completions are
+    read token by token, which allows early stopping and timing metrics.
+    """
+
+    def __init__(
+        self,
+        url: str = None,
+        timeout: float = LLM_TIMEOUT,
+        keep_alive: str = OLLAMA_KEEP_ALIVE,
+        pool_size: int = LLM_POOL_SIZE,
+        stream: bool = LLM_STREAM
+    ):
+        parts = urlsplit(url or _default_url())
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 11434
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.stream = stream
+        self._prefix_baselines = {}
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _unreachable(self, error: Exception) -> LLMClientError:
+        """
+        Error for a socket failure or a response cut short. Only a refused
+        connection or an unknown host (no server to talk to) is final.
+        """
+        if isinstance(error, TimeoutError):
+            return LLMClientError(f"Ollama at {self.host}:{self.port} timed out", retryable=True)
+        if isinstance(error, http.client.HTTPException):
+            return LLMClientError(
+                f"Ollama at {self.host}:{self.port} broke off the response: {error!r}",
+                retryable=True
+            )
+        return LLMClientError(
+            f"Ollama at {self.host}:{self.port} unreachable: {error}",
+            retryable=not isinstance(error, (ConnectionRefusedError, socket.gaierror))
+        )
+
+    def _open(self, method: str, path: str, payload: dict = None, timeout: float = None) -> tuple:
+        """
+        Send a request and return (connection, response) with the body unread.
+        timeout (default: the client's) applies to every socket operation.
+        """
+
+        body = None if payload is None else json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+
+        # A pooled connection may have been closed by the server while
+        # idle; retry once on a fresh connection in that case.
+        for attempt in range(2):
+            conn = self._acquire()
+            conn.timeout = timeout or self.timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(conn.timeout)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                return conn, conn.getresponse()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                conn.close()
+                if attempt == 0:
+                    continue
+                raise LLMClientError(
+                    f"Ollama at {self.host}:{self.port} closed the connection", retryable=True
+                )
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise self._unreachable(e)
+
+    def _read_json(self, conn: http.client.HTTPConnection, response) -> dict:
+        try:
+            data = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise self._unreachable(e)
+        self._release(conn)
+
+        try:
+            decoded = json.loads(data.decode("utf-8"))
+        except ValueError:
+            raise LLMClientError(f"Ollama returned invalid JSON (HTTP {response.status})")
+
+        if response.status != 200 or "error" in decoded:
+            raise LLMClientError(
+                f"Ollama error (HTTP {response.status}): {decoded.get('error', 'unknown error')}",
+                retryable=response.status >= 500
+            )
+
+        return decoded
+
+    def _request(self, method: str, path: str, payload: dict = None, timeout: float = None) -> dict:
+        return self._read_json(*self._open(method, path, payload, timeout))
+
+    def generate(
+        self,
+        prompt: str,
+        model: str = LLM_MODEL,
+        max_tokens: int = None,
+        stop_answers: int = None,
+        system: str = None,
+        format: dict = None,
+        timeout: float = None
+    ) -> dict:
+        """
+        /api/generate call. Returns a dict with the completion text under
+        "response" and per-call "metrics".
+
+        system is sent as Ollama's system prompt. Keeping it identical
+        across calls gives every prompt the same prefix, which the loaded
+        model (held by keep_alive) does not need to prefill again; the
+        estimated prefill time this saved is reported as
+        metrics["prefill_saved_seconds"].
+
+        format is a JSON schema the runtime constrains decoding to
+        (Ollama structured outputs). timeout (default: the client's) bounds
+        the whole call, including a streamed generation.
+
+        max_tokens caps generated tokens (Ollama num_predict). When
+        streaming, generation is cut off as soon as stop_answers answers
+        are complete (see reasoning.response_parser.completed_answers);
+        the connection is dropped, which makes Ollama stop the model.
+        """
+
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": self.stream,
+            "keep_alive": self.keep_alive,
+        }
+        if max_tokens is not None:
+            payload["options"] = {"num_predict": max_tokens}
+        if format is not None:
+            payload["format"] = format
+
+        baseline = None
+        if system:
+            payload["system"] = system
+            baseline = self._prefix_baselines.get((model, system))
+
+        timeout = timeout or self.timeout
+        start = time.monotonic()
+
+        if not self.stream:
+            result = self._request("POST", "/api/generate", payload, timeout)
+            result["metrics"] = _call_metrics(result, start, None, 0, False)
+            self._account_prefix(result, model, system, prompt, baseline)
+            return result
+
+        conn, response = self._open("POST", "/api/generate", payload, timeout)
+        if response.status != 200:
+            self._read_json(conn, response)  # raises with Ollama's error text
+
+        pieces, final = [], {}
+        first_token = None
+        stopped_early = False
+
+        try:
+            for line in response:
+                if not line.strip():
+                    continue
+                chunk = json.loads(line.decode("utf-8"))
+                if "error" in chunk:
+                    conn.close()
+                    raise LLMClientError(f"Ollama error: {chunk['error']}", retryable=True)
+
+                piece = chunk.get("response", "")
+                if piece:
+                    if first_token is None:
+                        first_token = time.monotonic()
+                    pieces.append(piece)
+
+                if chunk.get("done"):
+                    final = chunk
+                    break
+
+                if time.monotonic() - start > timeout:
+                    conn.close()
+                    raise LLMClientError(
+                        f"Ollama generation exceeded {timeout:.1f}s", retryable=True
+                    )
+
+                if stop_answers and _may_complete(piece, pieces):
+                    if completed_answers("".join(pieces)) >= stop_answers:
+                        stopped_early = True
+                        break
+            if not stopped_early:
+                response.read()
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise self._unreachable(e)
+        except ValueError:
+            conn.close()
+            raise LLMClientError("Ollama returned an invalid stream chunk")
+
+        if stopped_early:
+            conn.close()  # unread remainder; Ollama aborts on disconnect
+        elif not final:
+            conn.close()
+            raise LLMClientError(
+                f"Ollama at {self.host}:{self.port} ended the stream before it was done",
+                retryable=True
+            )
+        else:
+            self._release(conn)
+
+        final["response"] = "".join(pieces)
+        final["metrics"] = _call_metrics(final, start, first_token, len(pieces), stopped_early)
+        self._account_prefix(final, model, system, prompt, baseline)
+        return final
+
+    def _account_prefix(
+        self,
+        result: dict,
+        model: str,
+        system: str,
+        prompt: str,
+        baseline: dict
+    ) -> None:
+        """
+        Record the prefill time saved by prefix reuse on result's metrics.
+
+        Calls with a (model, system) pair started before any baseline
+        existed are candidates for the cold baseline; the one that
+        evaluated the longest prefix wins, since a concurrent first call
+        may already have found the prefix cached. Only calls started after
+        a baseline exists count as warm, so first calls never claim a
+        saving.
+        """
+
+        result["metrics"]["prefill_saved_seconds"] = _prefill_saved(result, prompt, baseline)
+        if system and baseline is None:
+            cold = _prefill_baseline(result, prompt)
+            if cold is None:
+                return
+            key = (model, system)
+            known = self._prefix_baselines.get(key)
+            if known is None or cold["prefix_tokens"] > known["prefix_tokens"]:
+                self._prefix_baselines[key] = cold
+
+    def model_digest(self, model: str = LLM_MODEL):
+        """
+        Digest of the locally installed model, or None if it is not listed.
+        Changes whenever the model is re-pulled or rebuilt.
+        """
+
+        if ":" not in model:
+            model += ":latest"
+        for entry in self._request("GET", "/api/tags").get("models", []):
+            if entry.get("name") == model or entry.get("model") == model:
+                return entry.get("digest")
+        return None
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def _may_complete(piece: str, pieces: list) -> bool:
+    """Cheap pre-check: an answer can only finish on a newline or a refusal."""
+
+    return "\n" in piece or "".join(pieces[-17:]).endswith(_REFUSAL)
+
+
+def _call_metrics(
+    result: dict,
+    start: float,
+    first_token: float,
+    streamed_tokens: int,
+    stopped_early: bool
+) -> dict:
+    """
+    Timing for one call. Ollama's own counters (eval_count, eval_duration
+    in ns) are used when the final chunk arrived; a stream cut short falls
+    back to counting chunks, which Ollama sends one per token.
+    """
+
+    end = time.monotonic()
+    tokens = result.get("eval_count", streamed_tokens)
+
+    if result.get("eval_duration"):
+        tokens_per_sec = tokens / (result["eval_duration"] / 1e9)
+    elif first_token is not None and end > first_token and tokens:
+        tokens_per_sec = tokens / (end - first_token)
+    else:
+        tokens_per_sec = None
+
+    prefill = result.get("prompt_eval_duration")
+
+    return {
+        "seconds": round(end - start, 3),
+        "ttft": None if first_token is None else round(first_token - start, 3),
+        "prompt_tokens": result.get("prompt_eval_count"),
+        "prefill_seconds": None if prefill is None else round(prefill / 1e9, 3),
+        "tokens": tokens,
+        "tokens_per_sec": None if tokens_per_sec is None else round(tokens_per_sec, 2),
+        "stopped_early": stopped_early,
+    }
+
+
+def _prefill_seconds(metrics: dict):
+    """Ollama's prefill time; time to first token for a stream cut short."""
+    if metrics["prefill_seconds"] is not None:
+        return metrics["prefill_seconds"]
+    return metrics["ttft"]
+
+
+def _prefill_baseline(result: dict, prompt: str):
+    """
+    Prefill of a cold call: tokens evaluated, their seconds, and the shared
+    prefix, i.e. everything evaluated beyond the call's own evidence
+    prompt. None when Ollama did not report its counters.
+    """
+
+    tokens = result.get("prompt_eval_count")
+    seconds = _prefill_seconds(result["metrics"])
+    if not tokens or not seconds:
+        return None
+
+    return {
+        "tokens": tokens,
+        "seconds": seconds,
+        "prefix_tokens": max(0, tokens - estimate_tokens(prompt)),
+    }
+
+
+def _prefill_saved(result: dict, prompt: str, baseline: dict) -> float:
+    """
+    Prefill seconds saved on the shared prefix compared with the cold
+    baseline for the same (model, prefix); nothing without a baseline.
+
+    Only the prefix is credited: of the tokens the warm call evaluated,
+    those beyond its own evidence prompt are prefix tokens it had to
+    re-read, and the rest of the prefix was reused. Reused tokens are
+    priced at the cold call's prefill rate. A warm call whose evidence is
+    shorter than the cold call's saves nothing by that alone.
+    """
+
+    evaluated = result.get("prompt_eval_count")
+    if baseline is None or evaluated is None:
+        return 0.0
+
+    prefix = baseline["prefix_tokens"]
+    reread = evaluated - estimate_tokens(prompt)
+    reused = max(0, min(prefix, prefix - reread))
+    return round(reused * baseline["seconds"] / baseline["tokens"], 3)
+
+
+def _default_url() -> str:
+    """OLLAMA_HOST (as used by the ollama CLI) wins over settings."""
+
+    host = os.environ.get("OLLAMA_HOST")
+    if not host:
+        return OLLAMA_URL
+    if "://" not in host:
+        host = f"http://{host}"
+    return host
+
+
+def make_client(
+    backend: str = LLM_BACKEND,
+    timeout: float = LLM_TIMEOUT,
+    concurrency: int = 1,
+    stream: bool = LLM_STREAM
+):
+    if backend == "http":
+        return OllamaHTTPClient(
+            timeout=timeout,
+            pool_size=max(concurrency, LLM_POOL_SIZE),
+            stream=stream
+        )
+    if backend == "cli":
+        return OllamaCLIClient(timeout=timeout)
+    raise ValueError(f"Unknown LLM backend: {backend}")
+
+
+_default_client = None
+
+
+def default_client():
+    global _default_client
+    if _default_client is None:
+        _default_client = make_client()
+    return _default_client
+
+
+def generate(
+    prompt: str,
+    model: str = LLM_MODEL,
+    client=None,
+    retries: int = LLM_RETRIES,
+    backoff: float = LLM_RETRY_BACKOFF,
+    deadline: float = None,
+    **options
+) -> dict:
+    """
+    Send one prompt to the local model; returns the client's result dict
+    ("response" text plus "metrics"). options go to client.generate.
+
+    Transient failures are retried up to `retries` times, waiting
+    backoff, 2 * backoff, 4 * backoff, ... seconds in between.
+
+    deadline is a time.monotonic() timestamp: each attempt's timeout is
+    cut to the time left, and a retry whose backoff would end past the
+    deadline is not attempted.
+
+    Raises LLMClientError when the runtime fails, instead of returning an
+    empty answer.
+    """
+
+    client = client or default_client()
+
+    for attempt in range(retries + 1):
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LLMClientError("run deadline reached before the model call")
+            options["timeout"] = min(client.timeout, remaining)
+
+        try:
+            result = client.generate(prompt, model=model, **options)
+        except LLMClientError as e:
+            if not e.retryable or attempt == retries:
+                raise
+            wait = backoff * 2 ** attempt
+            if deadline is not None and time.monotonic() + wait >= deadline:
+                raise
+            time.sleep(wait)
+            continue
+
+        if attempt and "metrics" in result:
+            result["metrics"]["retries"] = attempt
+        return result
+
+
+def call_ollama(prompt: str, model: str = LLM_MODEL, client=None, **options) -> str:
+    """
+    Send one prompt to the local model and return the completion text.
+    """
 
-    return process.stdout.decode("utf-8", errors="ignore").strip()
+    return generate(prompt, model, client, **options)["response"].strip()
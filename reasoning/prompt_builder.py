@@ -1,15 +1,15 @@
 # reasoning/prompt_builder.py
 
-def build_unanswered_question_prompt(signal: dict) -> str:
-    """
-    Build a strict prompt that forces the LLM to derive
-    exactly one unanswered research question from ONE evidence signal.
-    """
+from config.settings import (
+    LLM_BATCH_MAX_TOKENS,
+    LLM_BATCH_SIGNALS,
+    LLM_OUTPUT_MODE,
+    LLM_PROMPT_LAYOUT,
+)
+from structuring.tokens import estimate_tokens
 
-    return f"""
-You are a research assistant.
 
-Your task:
+_RULES = """
 - Derive exactly ONE unanswered research question.
 - The question must arise ONLY from the provided evidence.
 - The question must be specific and non-generic.
@@ -17,8 +17,17 @@ Your task:
 - Do NOT propose solutions.
 - Do NOT invent new context.
 - Do NOT discuss impact in broad or survey terms.
+""".strip()
 
-Evidence signal:
+_ANSWER_FORMAT = """
+QUESTION: <one clear, specific research question in a single sentence>
+WHY: <one or two sentences explaining why this question exists based only on the evidence>
+MISSING: <what data, experiment, comparison, or evaluation is missing>
+""".strip()
+
+
+def _evidence_block(signal: dict) -> str:
+    return f"""
 - Signal type: {signal['signal_type']}
 - Paper: {signal['paper_id']}
 - Page: {signal['page_number']}
@@ -26,15 +35,216 @@ Evidence signal:
 
 Excerpt:
 \"\"\"{signal['text_excerpt']}\"\"\"
+""".strip()
+
+
+def build_unanswered_question_prompt(signal: dict) -> str:
+    """
+    Build a strict prompt that forces the LLM to derive
+    exactly one unanswered research question from ONE evidence signal.
+    """
+
+    return f"""
+You are a research assistant.
+
+Your task:
+{_RULES}
+
+Evidence signal:
+{_evidence_block(signal)}
 
 Respond in the following strict format.
 Do NOT add headings, markdown, or extra text.
 
-QUESTION: <one clear, specific research question in a single sentence>
-WHY: <one or two sentences explaining why this question exists based only on the evidence>
-MISSING: <what data, experiment, comparison, or evaluation is missing>
+{_ANSWER_FORMAT}
 
 If no valid unanswered research question can be derived from this evidence,
 respond with exactly:
 NO_VALID_QUESTION
 """.strip()
+
+
+def build_batched_question_prompt(signals: list) -> str:
+    """
+    Build one prompt covering several evidence signals.
+
+    The instructions appear once; each signal is a numbered evidence block
+    and the model must answer every number separately, so the answers can
+    be split back with reasoning.response_parser.parse_numbered_answers.
+    """
+
+    blocks = "\n\n".join(
+        f"[{number}]\n{_evidence_block(signal)}"
+        for number, signal in enumerate(signals, start=1)
+    )
+
+    return f"""
+You are a research assistant.
+
+Your task, for EACH numbered evidence signal below, independently:
+{_RULES}
+
+Evidence signals:
+
+{blocks}
+
+Answer every evidence signal, in order, in the following strict format.
+Start each answer with its number in square brackets on its own line.
+Do NOT add headings, markdown, or extra text.
+
+[<number>]
+{_ANSWER_FORMAT}
+
+If no valid unanswered research question can be derived from a signal,
+answer that number with exactly:
+[<number>]
+NO_VALID_QUESTION
+""".strip()
+
+
+# --- Prefix-stable layout ---
+# The instructions never change within a run, so they are sent as a fixed
+# system prompt and only the evidence varies. Runtimes that keep the
+# evaluated prompt prefix (Ollama with keep_alive) then prefill just the
+# evidence on every call after the first.
+
+SYSTEM_PROMPT = f"""
+You are a research assistant.
+
+Your task:
+{_RULES}
+
+Respond in the following strict format.
+Do NOT add headings, markdown, or extra text.
+
+{_ANSWER_FORMAT}
+
+If no valid unanswered research question can be derived from the evidence,
+respond with exactly:
+NO_VALID_QUESTION
+""".strip()
+
+BATCH_SYSTEM_PROMPT = f"""
+You are a research assistant.
+
+Your task, for EACH numbered evidence signal you are given, independently:
+{_RULES}
+
+Answer every evidence signal, in order, in the following strict format.
+Start each answer with its number in square brackets on its own line.
+Do NOT add headings, markdown, or extra text.
+
+[<number>]
+{_ANSWER_FORMAT}
+
+If no valid unanswered research question can be derived from a signal,
+answer that number with exactly:
+[<number>]
+NO_VALID_QUESTION
+""".strip()
+
+
+# Structured output mode: the runtime constrains decoding to the schemas
+# in contracts.output_schema, these instructions describe the same shape
+
+JSON_SYSTEM_PROMPT = f"""
+You are a research assistant.
+
+Your task:
+{_RULES}
+
+Respond with one JSON object:
+{{"valid": true, "question": "<one clear, specific research question in a single sentence>", "why": "<one or two sentences explaining why this question exists based only on the evidence>", "missing": "<what data, experiment, comparison, or evaluation is missing>"}}
+
+If no valid unanswered research question can be derived from the evidence,
+respond with:
+{{"valid": false, "question": "", "why": "", "missing": ""}}
+""".strip()
+
+JSON_BATCH_SYSTEM_PROMPT = f"""
+You are a research assistant.
+
+Your task, for EACH numbered evidence signal you are given, independently:
+{_RULES}
+
+Respond with one JSON object holding one answer per evidence signal, in order:
+{{"answers": [{{"number": <number>, "valid": true, "question": "<one clear, specific research question in a single sentence>", "why": "<one or two sentences explaining why this question exists based only on the evidence>", "missing": "<what data, experiment, comparison, or evaluation is missing>"}}]}}
+
+If no valid unanswered research question can be derived from a signal,
+its answer is:
+{{"number": <number>, "valid": false, "question": "", "why": "", "missing": ""}}
+""".strip()
+
+
+def build_prompt(
+    signals: list,
+    layout: str = LLM_PROMPT_LAYOUT,
+    output: str = LLM_OUTPUT_MODE
+) -> tuple:
+    """
+    Return (system, prompt) for one or more signals.
+
+    "prefix" puts the fixed instructions in system and only the evidence
+    in prompt; "inline" returns system=None and the full prompt (built by
+    build_unanswered_question_prompt / build_batched_question_prompt for
+    text output). output "json" asks for answers shaped like
+    contracts.output_schema instead of QUESTION/WHY/MISSING lines.
+    """
+
+    if layout == "inline" and output == "text":
+        if len(signals) == 1:
+            return None, build_unanswered_question_prompt(signals[0])
+        return None, build_batched_question_prompt(signals)
+
+    if len(signals) == 1:
+        system = JSON_SYSTEM_PROMPT if output == "json" else SYSTEM_PROMPT
+        prompt = f"Evidence signal:\n{_evidence_block(signals[0])}"
+    else:
+        system = JSON_BATCH_SYSTEM_PROMPT if output == "json" else BATCH_SYSTEM_PROMPT
+        blocks = "\n\n".join(
+            f"[{number}]\n{_evidence_block(signal)}"
+            for number, signal in enumerate(signals, start=1)
+        )
+        prompt = f"Evidence signals:\n\n{blocks}"
+
+    if layout == "inline":
+        return None, f"{system}\n\n{prompt}"
+    return system, prompt
+
+
+# Batched prompt without evidence, counted once per batch
+_BATCH_OVERHEAD_TOKENS = estimate_tokens(build_batched_question_prompt([]))
+
+
+def pack_signals(
+    signals: list,
+    max_signals: int = LLM_BATCH_SIGNALS,
+    max_tokens: int = LLM_BATCH_MAX_TOKENS
+) -> list:
+    """
+    Group consecutive signals into batches for build_batched_question_prompt.
+
+    A batch holds at most max_signals signals and is closed before its
+    estimated prompt size would exceed max_tokens. A signal too large for
+    the budget on its own still gets a batch of one.
+
+    Returns a list of (positions, signals) pairs, positions being indexes
+    into the input list.
+    """
+
+    batches = []
+    positions, group, used = [], [], _BATCH_OVERHEAD_TOKENS
+
+    for position, signal in enumerate(signals):
+        cost = estimate_tokens(_evidence_block(signal)) + 2  # "[n]" header
+        if group and (len(group) >= max_signals or used + cost > max_tokens):
+            batches.append((positions, group))
+            positions, group, used = [], [], _BATCH_OVERHEAD_TOKENS
+        positions.append(position)
+        group.append(signal)
+        used += cost
+
+    if group:
+        batches.append((positions, group))
+
+    return batches
@@ -0,0 +1,219 @@
+# reasoning/response_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from config.settings import (
+    LLM_CACHE_MAX_AGE_DAYS,
+    LLM_CACHE_MAX_BYTES,
+    LLM_CACHE_MODE,
+    LLM_CACHE_PATH,
+    LLM_MODEL,
+)
+from reasoning.llm_client import LLMClientError
+
+
+CACHE_MODES = ("on", "read-only", "off")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    model TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (model, digest, prompt_hash)
+)
+"""
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite store of model responses keyed by (model, digest, prompt hash).
+
+    digest is the installed model's digest when the backend can report it
+    ("" otherwise), so re-pulling a model invalidates its entries.
+    Entries older than max_age_days are dropped, then the least recently
+    used ones until the stored responses fit in max_bytes. Eviction runs
+    when the cache is opened and when a writable cache is closed.
+
+    Safe to share between the worker threads of one run.
+    """
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        read_only: bool = False,
+        max_bytes: int = LLM_CACHE_MAX_BYTES,
+        max_age_days: float = LLM_CACHE_MAX_AGE_DAYS
+    ):
+        self.read_only = read_only
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evicted": 0}
+        self._lock = threading.Lock()
+
+        if read_only:
+            if not os.path.exists(path):
+                self._db = None
+                return
+            # as_uri percent-encodes "?", "#" and "%" and handles drive letters
+            uri = Path(path).resolve().as_uri() + "?mode=ro"
+            self._db = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(_SCHEMA)
+            self._evict()
+
+    def get(self, model: str, digest: str, prompt: str):
+        """Return the cached response text, or None on a miss."""
+
+        key = (model, digest or "", prompt_hash(prompt))
+
+        with self._lock:
+            row = None
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT response FROM responses"
+                        " WHERE model = ? AND digest = ? AND prompt_hash = ?",
+                        key
+                    ).fetchone()
+                except sqlite3.OperationalError:
+                    row = None  # read-only cache without the table yet
+
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+
+            self.stats["hits"] += 1
+            if not self.read_only:
+                self._db.execute(
+                    "UPDATE responses SET last_used = ?"
+                    " WHERE model = ? AND digest = ? AND prompt_hash = ?",
+                    (time.time(), *key)
+                )
+                self._db.commit()
+            return row[0]
+
+    def put(self, model: str, digest: str, prompt: str, response: str) -> None:
+        if self.read_only:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    model, digest or "", prompt_hash(prompt), response,
+                    len(response.encode("utf-8")), now, now,
+                )
+            )
+            self._db.commit()
+            self.stats["stores"] += 1
+
+    def _evict(self) -> None:
+        cutoff = time.time() - self.max_age_days * 86400
+        evicted = self._db.execute(
+            "DELETE FROM responses WHERE created < ?", (cutoff,)
+        ).rowcount
+
+        total = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+        if total > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT rowid, size FROM responses ORDER BY last_used"
+            ).fetchall()
+            stale = []
+            for rowid, size in rows:
+                if total <= self.max_bytes:
+                    break
+                stale.append((rowid,))
+                total -= size
+            self._db.executemany("DELETE FROM responses WHERE rowid = ?", stale)
+            evicted += len(stale)
+
+        self._db.commit()
+        self.stats["evicted"] += evicted
+
+    def close(self) -> None:
+        if self._db is None:
+            return
+        with self._lock:
+            if not self.read_only:
+                self._evict()
+            self._db.close()
+            self._db = None
+
+
+class CachedClient:
+    """
+    Wraps a reasoning.llm_client client so identical prompts to the same
+    model are answered from a ResponseCache instead of the runtime.
+    """
+
+    def __init__(self, client, cache: ResponseCache):
+        self.client = client
+        self.cache = cache
+        self._digests = {}
+
+    @property
+    def timeout(self):
+        return self.client.timeout
+
+    def model_digest(self, model: str = LLM_MODEL):
+        if model not in self._digests:
+            try:
+                self._digests[model] = self.client.model_digest(model)
+            except LLMClientError:
+                self._digests[model] = None
+        return self._digests[model]
+
+    def generate(self, prompt: str, model: str = LLM_MODEL, **options) -> dict:
+        """
+        options are passed to the wrapped client and are part of the key,
+        since limits such as max_tokens can change the response. A per-call
+        timeout does not change the response and is left out.
+        """
+
+        digest = self.model_digest(model)
+        key = prompt
+        keyed = {k: v for k, v in options.items() if k != "timeout"}
+        if keyed:
+            key += "\0" + json.dumps(keyed, sort_keys=True)
+
+        response = self.cache.get(model, digest, key)
+        if response is not None:
+            return {"response": response, "cached": True}
+
+        result = self.client.generate(prompt, model=model, **options)
+        self.cache.put(model, digest, key, result["response"])
+        return result
+
+    def close(self) -> None:
+        self.client.close()
+        self.cache.close()
+
+
+def with_cache(client, mode: str = LLM_CACHE_MODE, path: str = LLM_CACHE_PATH):
+    """Return client wrapped for the given cache mode ("off" leaves it as is)."""
+
+    if mode not in CACHE_MODES:
+        raise ValueError(f"Unknown LLM cache mode: {mode}")
+    if mode == "off":
+        return client
+    return CachedClient(client, ResponseCache(path, read_only=mode == "read-only"))
@@ -0,0 +1,161 @@
+# reasoning/response_parser.py
+
+import json
+import re
+
+from contracts.output_schema import ANSWER_FIELDS
+
+
+# "[3]" at the start of a line opens the answer to evidence block 3
+_ANSWER_HEADER = re.compile(r"^[ \t]*\[(\d+)\][ \t]*", re.MULTILINE)
+
+_FIELDS = ("QUESTION:", "WHY:", "MISSING:")
+
+REFUSAL = "NO_VALID_QUESTION"
+
+# A MISSING line is finished once the newline after its content arrives
+_MISSING_DONE = re.compile(r"^[ \t]*MISSING:[^\n]*\S[^\n]*\n", re.MULTILINE)
+
+
+def completed_answers(text: str) -> int:
+    """
+    Count answers already complete in a partial response: each refusal,
+    and each MISSING line that has been terminated.
+    """
+
+    return text.count(REFUSAL) + len(_MISSING_DONE.findall(text))
+
+
+def is_well_formed(answer: str) -> bool:
+    """
+    True if answer is NO_VALID_QUESTION or carries non-empty QUESTION, WHY
+    and MISSING lines in that order.
+    """
+
+    answer = answer.strip()
+    if answer == REFUSAL:
+        return True
+
+    lines = [line.strip() for line in answer.splitlines() if line.strip()]
+    found = [line for line in lines if line.startswith(_FIELDS)]
+
+    if [line.split(":", 1)[0] + ":" for line in found] != list(_FIELDS):
+        return False
+    return all(line.split(":", 1)[1].strip() for line in found)
+
+
+def parse_numbered_answers(response: str, count: int) -> dict:
+    """
+    Split a batched response into {number: answer} for numbers 1..count.
+
+    Only well-formed answers are returned. Numbers that are missing,
+    repeated or malformed are left out so the caller can re-ask them
+    one by one.
+    """
+
+    headers = list(_ANSWER_HEADER.finditer(response))
+    answers = {}
+    repeated = set()
+
+    for i, header in enumerate(headers):
+        number = int(header.group(1))
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(response)
+        body = response[header.end():end].strip()
+
+        if not 1 <= number <= count:
+            continue
+        if number in answers:
+            repeated.add(number)
+            continue
+        answers[number] = body
+
+    return {
+        number: body
+        for number, body in answers.items()
+        if number not in repeated and is_well_formed(body)
+    }
+
+
+def answer_fields(answer: str) -> dict:
+    """
+    Split a text answer into {"question", "why", "missing"}; fields the
+    answer lacks are empty strings.
+    """
+
+    fields = dict.fromkeys(ANSWER_FIELDS, "")
+    for line in answer.splitlines():
+        label, sep, value = line.strip().partition(":")
+        key = label.lower()
+        if sep and key in fields and not fields[key]:
+            fields[key] = value.strip()
+    return fields
+
+
+# --- Structured (JSON) answers, see contracts.output_schema ---
+
+def _is_json_answer(item) -> bool:
+    return (
+        isinstance(item, dict)
+        and isinstance(item.get("valid"), bool)
+        and all(isinstance(item.get(field), str) for field in ANSWER_FIELDS)
+    )
+
+
+def render_answer(answer: dict) -> str:
+    """Text form of a JSON answer, so both modes share one validation path."""
+
+    if not answer["valid"]:
+        return REFUSAL
+    return "\n".join(
+        f"{field.upper()}: {answer[field].strip()}" for field in ANSWER_FIELDS
+    )
+
+
+def parse_json_answer(response: str):
+    """
+    Text form of a JSON answer matching ANSWER_SCHEMA, or None when the
+    response is not such an object.
+    """
+
+    try:
+        answer = json.loads(response)
+    except ValueError:
+        return None
+    if not _is_json_answer(answer):
+        return None
+    return render_answer(answer)
+
+
+def parse_json_answers(response: str, count: int) -> dict:
+    """
+    JSON counterpart of parse_numbered_answers for BATCH_ANSWER_SCHEMA
+    responses: {number: answer text} for well-formed answers only.
+    """
+
+    try:
+        data = json.loads(response)
+    except ValueError:
+        return {}
+
+    items = data.get("answers") if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        return {}
+
+    answers = {}
+    repeated = set()
+    for item in items:
+        number = item.get("number") if isinstance(item, dict) else None
+        if not _is_json_answer(item) or type(number) is not int:  # bool is an int
+            continue
+        if not 1 <= number <= count:
+            continue
+        if number in answers:
+            repeated.add(number)
+            continue
+        answers[number] = render_answer(item)
+
+    return {
+        number: answer
+        for number, answer in answers.items()
+        if number not in repeated and is_well_formed(answer)
+    }
@@ -1,5 +1,33 @@
 # structuring/chunker.py
 
+import re
+from collections import deque
+
+from config.settings import CHUNK_MAX_TOKENS, CHUNK_OVERLAP_TOKENS
+from structuring.tokens import estimate_tokens
+
+
+_WORD = re.compile(r"\S+")
+
+def iter_chunks(enriched_pages):
+    """
+    Streaming form of chunk_pages: yields one chunk per non-empty page.
+    """
+
+    for page in enriched_pages:
+        if not page.get("text"):
+            continue  # skip empty pages
+
+        yield {
+            "chunk_id": f"{page['paper_id']}_page_{page['page_number']}",
+            "paper_id": page["paper_id"],
+            "page_number": page["page_number"],
+            "section": page["section"],
+            "sections": page["sections"],
+            "text": page["text"],
+        }
+
+
 def chunk_pages(enriched_pages: list) -> list:
     """
     Convert page-level enriched data into reasoning chunks.
@@ -14,6 +42,7 @@ def chunk_pages(enriched_pages: list) -> list:
             "paper_id": str,
             "page_number": int,
             "section": str,
+            "sections": [(start, end, section), ...],
             "text": str
         }
     ]
@@ -25,25 +54,127 @@ def chunk_pages(enriched_pages: list) -> list:
             "paper_id": str,
             "page_number": int,
             "section": str,
+            "sections": [(start, end, section), ...],
             "text": str
         }
     ]
     """
 
-    chunks = []
+    return list(iter_chunks(enriched_pages))
 
-    for idx, page in enumerate(enriched_pages):
-        if not page.get("text"):
-            continue  # skip empty pages
 
-        chunk = {
-            "chunk_id": f"{page['paper_id']}_page_{page['page_number']}",
-            "paper_id": page["paper_id"],
-            "page_number": page["page_number"],
-            "section": page["section"],
-            "text": page["text"],
-        }
+def _emit_chunk(window: deque, paper_id: str, index: int, overlap_words: int) -> dict:
+    first = window[0]
+    last = window[-1]
+
+    # (start, section) wherever the section at the words' offsets changes
+    bounds = []
+    offset = 0
+    for word in window:
+        if not bounds or bounds[-1][1] != word["section_at"]:
+            bounds.append((offset, word["section_at"]))
+        offset += len(word["text"]) + 1
+    ends = [start for start, _ in bounds[1:]] + [offset - 1]
+
+    overlap = [window[i]["text"] for i in range(overlap_words)]
+
+    return {
+        "chunk_id": f"{paper_id}_chunk_{index}",
+        "paper_id": paper_id,
+        "page_number": first["page_number"],
+        "section": first["section"],
+        "sections": [(start, end, section) for (start, section), end in zip(bounds, ends)],
+        "text": " ".join(word["text"] for word in window),
+        "overlap_chars": len(" ".join(overlap)),
+        "span": {
+            "page_start": first["page_number"],
+            "page_end": last["page_number"],
+            "char_offsets": [first["start"], last["end"]],
+        },
+    }
+
+
+def iter_budgeted_chunks(
+    enriched_pages,
+    max_tokens: int = CHUNK_MAX_TOKENS,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS
+):
+    """
+    Yield chunks built from a token budget instead of page boundaries.
+
+    v1 Strategy:
+    - A chunk closes once it reaches max_tokens (estimated)
+    - The next chunk repeats the last overlap_tokens of the previous one
+    - Chunks cross page boundaries, so a paragraph split by a page break
+      stays together
+
+    Each chunk keeps page_number/section of the page it starts on,
+    sections spans (see ingestion.metadata.label_sections) in chunk text
+    offsets, overlap_chars (the length of the leading text repeated from
+    the previous chunk, so evidence found there is attributed to that
+    chunk only; see evidence.matcher.match_banks), and a span:
+        {"page_start": int, "page_end": int, "char_offsets": [start, end]}
+    where start is an offset into page_start's text and end an offset
+    into page_end's text.
+
+    Only the current window of words is held in memory.
+    """
+
+    window = deque()
+    window_tokens = 0
+    fresh = 0  # words not yet emitted in any chunk
+    overlap_words = 0  # leading words of the window repeated from the last chunk
+    index = 0
+    paper_id = None
+
+    for page in enriched_pages:
+        paper_id = page["paper_id"]
+        spans = iter(page["sections"])
+        span = next(spans)
+
+        for match in _WORD.finditer(page.get("text", "")):
+            while match.start() >= span[1]:
+                span = next(spans)
+            word = {
+                "text": match.group(),
+                "tokens": estimate_tokens(match.group()),
+                "start": match.start(),
+                "end": match.end(),
+                "page_number": page["page_number"],
+                "section": page["section"],
+                "section_at": span[2],
+            }
+            window.append(word)
+            window_tokens += word["tokens"]
+            fresh += 1
+
+            if window_tokens < max_tokens:
+                continue
+
+            index += 1
+            yield _emit_chunk(window, paper_id, index, overlap_words)
+
+            # Keep the tail of the window as overlap for the next chunk
+            tail = deque()
+            kept = 0
+            while window and kept + window[-1]["tokens"] <= overlap_tokens:
+                word = window.pop()
+                kept += word["tokens"]
+                tail.appendleft(word)
+
+            window = tail
+            window_tokens = kept
+            fresh = 0
+            overlap_words = len(tail)
+
+    if window and fresh:
+        index += 1
+        yield _emit_chunk(window, paper_id, index, overlap_words)
 
-        chunks.append(chunk)
 
-    return chunks
+def chunk_pages_budgeted(
+    enriched_pages: list,
+    max_tokens: int = CHUNK_MAX_TOKENS,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS
+) -> list:
+    return list(iter_budgeted_chunks(enriched_pages, max_tokens, overlap_tokens))
@@ -0,0 +1,17 @@
+# structuring/tokens.py
+
+from config.settings import CHARS_PER_TOKEN
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate for budgeting and reporting.
+
+    No tokenizer is loaded: local models average roughly CHARS_PER_TOKEN
+    characters per token on English prose, which is close enough to size
+    prompts and chunks.
+    """
+
+    if not text:
+        return 0
+    return -(-len(text) // CHARS_PER_TOKEN)
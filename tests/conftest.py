@@ -0,0 +1,107 @@
+# tests/conftest.py
+
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+ANSWER = "QUESTION: Why does it fail?\nWHY: It was not evaluated.\nMISSING: A held-out test."
+
+
+def reply(handler, status: int, payload: dict) -> None:
+    """Send one JSON response."""
+
+    body = json.dumps(payload).encode("utf-8")
+    handler.send_response(status)
+    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Length", str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+def stream(handler, chunks) -> int:
+    """
+    Send chunks as a chunked NDJSON stream; returns how many were written
+    before the client went away.
+    """
+
+    handler.send_response(200)
+    handler.send_header("Content-Type", "application/x-ndjson")
+    handler.send_header("Transfer-Encoding", "chunked")
+    handler.end_headers()
+
+    written = 0
+    try:
+        for chunk in chunks:
+            line = (json.dumps(chunk) + "\n").encode("utf-8")
+            handler.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+            handler.wfile.flush()
+            written += 1
+        handler.wfile.write(b"0\r\n\r\n")
+    except (BrokenPipeError, ConnectionResetError):
+        handler.close_connection = True
+    return written
+
+
+def answer(handler, request: dict) -> None:
+    """Default behaviour: one complete answer, streamed when asked to."""
+
+    if request.get("stream"):
+        stream(handler, [
+            {"response": ANSWER, "done": False},
+            {"response": "", "done": True, "eval_count": 12, "eval_duration": 10 ** 8},
+        ])
+    else:
+        reply(handler, 200, {"response": ANSWER, "done": True})
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(request)
+        self.server.respond(self, request)
+
+
+class FakeOllama(ThreadingHTTPServer):
+    """
+    Stand-in for the Ollama HTTP API on a free local port. respond(handler,
+    request) decides each /api/generate response.
+    """
+
+    daemon_threads = True
+    block_on_close = False
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.connections = 0
+        self.requests = []
+        self.respond = answer
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+@pytest.fixture
+def ollama():
+    server = FakeOllama()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
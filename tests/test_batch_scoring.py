@@ -0,0 +1,58 @@
+# tests/test_batch_scoring.py
+
+import random
+
+from evidence.batch_scoring import build_hit_matrix, extract_signals_batch, score_matrix
+from evidence.signals import SECTION_WEIGHT, extract_signals
+
+
+_SECTIONS = ["introduction", "methods", "results", "discussion", "limitations", "unknown"]
+
+_PHRASES = [
+    "a limitation of this study", "future work", "was not assessed",
+    "it may ", "results could ", "this suggests", "it appears to",
+    "unclear", "we assume", "is widely accepted", "the data", "the model",
+    "in the cohort", "remains to be determined", "not clear",
+]
+
+
+def _random_chunk(rng: random.Random, index: int) -> dict:
+    text = " ".join(rng.choice(_PHRASES) for _ in range(rng.randint(0, 12)))
+    section = rng.choice(_SECTIONS)
+    chunk = {
+        "chunk_id": f"P_chunk_{index}",
+        "paper_id": "P",
+        "page_number": index,
+        "section": section,
+        "text": text,
+    }
+    if text and rng.random() < 0.5:
+        cut = rng.randint(0, len(text))
+        chunk["sections"] = [(0, cut, section), (cut, len(text), rng.choice(_SECTIONS))]
+        if cut == 0:
+            chunk["sections"] = chunk["sections"][1:]
+    return chunk
+
+
+def test_batch_matches_per_signal_scoring_on_random_chunks():
+    rng = random.Random(12)
+    chunks = [_random_chunk(rng, i) for i in range(3000)]
+
+    assert extract_signals_batch(chunks) == extract_signals(chunks)
+
+
+def test_rescoring_reuses_the_matrix():
+    rng = random.Random(3)
+    matrix = build_hit_matrix([_random_chunk(rng, i) for i in range(200)])
+
+    default, _ = score_matrix(matrix)
+    flat, _ = score_matrix(matrix, section_weights=dict.fromkeys(SECTION_WEIGHT, 0))
+    doubled, _ = score_matrix(matrix, pattern_weights=[2.0] * len(matrix["patterns"]))
+
+    assert (flat <= default).all()
+    assert (doubled >= default).all()
+
+
+def test_no_chunks():
+    assert extract_signals_batch([]) == []
+    assert extract_signals_batch([{"paper_id": "P", "page_number": 1, "text": ""}]) == []
@@ -0,0 +1,39 @@
+# tests/test_extractor.py
+
+from reasoning.extractor import answer_signals, new_stats
+from reasoning.llm_client import OllamaHTTPClient
+from reasoning.response_cache import with_cache
+
+
+def _signal(page: int) -> dict:
+    return {
+        "signal_type": "limitation",
+        "matched_patterns": ["limitation"],
+        "signal_score": 5,
+        "paper_id": "P",
+        "page_number": page,
+        "section": "limitations",
+        "text_excerpt": f"A key limitation is the small cohort on page {page}.",
+    }
+
+
+def test_cached_answers_are_not_counted_as_model_calls(ollama, tmp_path):
+    signals = [_signal(1), _signal(2)]
+    path = str(tmp_path / "responses.sqlite3")
+    runs = []
+    for _ in range(2):
+        client = with_cache(OllamaHTTPClient(ollama.url, stream=False), "on", path)
+        stats = new_stats()
+        try:
+            answers = answer_signals(signals, model="tiny", client=client, batch_signals=1, stats=stats)
+        finally:
+            client.close()
+        assert all(answers)
+        runs.append(stats)
+
+    cold, warm = runs
+    assert (cold["prompts"], cold["cached"]) == (2, 0)
+    assert cold["tiers"]["tiny"]["calls"] == 2
+    assert (warm["prompts"], warm["cached"]) == (0, 2)
+    assert warm["tiers"]["tiny"] == {"calls": 0, "seconds": 0.0}
+    assert len(ollama.requests) == 2
@@ -0,0 +1,52 @@
+# tests/test_gate.py
+
+import random
+
+import pytest
+
+from config.settings import GATE_MIN_EXAMPLES
+from reasoning.gate import recall_threshold, refusal_probability, train
+
+
+_WORDS = ["unclear", "may", "cohort", "limitation", "noise", "sample", "trial", "bias"]
+
+
+def _outcomes(count: int, seed: int = 0) -> list:
+    """Refusals lean towards hedging words, answers towards concrete ones."""
+
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        refused = rng.random() < 0.4
+        weights = [3, 3, 1, 1, 1, 1, 1, 1] if refused else [1, 1, 3, 3, 2, 2, 2, 2]
+        words = set(rng.choices(_WORDS, weights, k=4))
+        rows.append({"features": [f"w:{w}" for w in words], "refused": refused})
+    return rows
+
+
+def test_train_needs_enough_outcomes_of_both_kinds():
+    rows = _outcomes(GATE_MIN_EXAMPLES)
+
+    assert train(rows[:GATE_MIN_EXAMPLES - 1]) is None
+    assert train([dict(row, refused=False) for row in rows]) is None
+    assert train(rows) is not None
+
+
+@pytest.mark.parametrize("min_recall", [0.5, 0.8, 0.95, 1.0])
+def test_threshold_keeps_min_recall_of_answered_signals(min_recall):
+    rows = _outcomes(200)
+    model = train(rows)
+
+    threshold = recall_threshold(model, rows, min_recall)
+
+    answered = [set(r["features"]) for r in rows if not r["refused"]]
+    sent = [f for f in answered if refusal_probability(model, f) <= threshold]
+    assert len(sent) >= min_recall * len(answered)
+
+
+def test_threshold_never_drops_below_even_odds():
+    rows = _outcomes(200)
+    model = train(rows)
+
+    assert recall_threshold(model, rows, 0.0) == 0.5
+    assert recall_threshold(model, [r for r in rows if r["refused"]], 0.9) == 0.5
@@ -0,0 +1,216 @@
+# tests/test_llm_client.py
+
+import socket
+import time
+
+import pytest
+
+from conftest import ANSWER, answer, reply, stream
+from reasoning.llm_client import LLMClientError, OllamaHTTPClient, generate
+from structuring.tokens import estimate_tokens
+
+
+def _slow(seconds: float):
+    def respond(handler, request):
+        time.sleep(seconds)
+        try:
+            reply(handler, 200, {"response": ANSWER, "done": True})
+        except OSError:
+            pass  # the client gave up
+    return respond
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_calls_reuse_one_connection(ollama, streamed):
+    client = OllamaHTTPClient(ollama.url, stream=streamed)
+    try:
+        for _ in range(5):
+            assert client.generate("evidence")["response"] == ANSWER
+    finally:
+        client.close()
+
+    assert len(ollama.requests) == 5
+    assert ollama.connections == 1
+    assert all(r["keep_alive"] for r in ollama.requests)
+
+
+def test_timeout_raises_retryable_error(ollama):
+    ollama.respond = _slow(2.0)
+    client = OllamaHTTPClient(ollama.url, timeout=0.2, stream=False)
+
+    start = time.monotonic()
+    with pytest.raises(LLMClientError) as error:
+        client.generate("evidence")
+
+    assert error.value.retryable
+    assert time.monotonic() - start < 1.5
+
+
+def test_deadline_bounds_attempts_and_skips_retries(ollama):
+    ollama.respond = _slow(2.0)
+    client = OllamaHTTPClient(ollama.url, timeout=30, stream=False)
+
+    start = time.monotonic()
+    with pytest.raises(LLMClientError):
+        generate("evidence", client=client, retries=3, backoff=0.05, deadline=start + 0.3)
+
+    assert time.monotonic() - start < 1.5
+    assert len(ollama.requests) == 1
+
+
+def test_error_response_raises_instead_of_empty_answer(ollama):
+    ollama.respond = lambda handler, request: reply(
+        handler, 404, {"error": "model 'missing' not found"}
+    )
+    client = OllamaHTTPClient(ollama.url, stream=False)
+
+    with pytest.raises(LLMClientError, match="not found") as error:
+        client.generate("evidence", model="missing")
+    assert not error.value.retryable
+
+
+def test_error_in_stream_raises(ollama):
+    ollama.respond = lambda handler, request: stream(handler, [{"error": "out of memory"}])
+    client = OllamaHTTPClient(ollama.url, stream=True)
+
+    with pytest.raises(LLMClientError, match="out of memory"):
+        client.generate("evidence")
+
+
+def test_unreachable_server_raises():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    client = OllamaHTTPClient(f"http://127.0.0.1:{port}", timeout=1)
+    with pytest.raises(LLMClientError, match="unreachable") as error:
+        client.generate("evidence")
+    assert not error.value.retryable
+
+
+def test_stream_stops_once_answers_are_complete(ollama):
+    sent = {}
+
+    def respond(handler, request):
+        pieces = [{"response": line + "\n", "done": False} for line in ANSWER.splitlines()]
+        filler = ({"response": " filler", "done": False} for _ in range(500))
+
+        def slowly(chunks):
+            for chunk in chunks:
+                yield chunk
+                time.sleep(0.005)
+
+        sent["chunks"] = stream(handler, slowly([*pieces, *filler]))
+
+    ollama.respond = respond
+    client = OllamaHTTPClient(ollama.url, stream=True)
+
+    result = client.generate("evidence", stop_answers=1, max_tokens=64)
+
+    assert result["response"] == ANSWER + "\n"
+    assert result["metrics"]["stopped_early"]
+    assert ollama.requests[0]["options"] == {"num_predict": 64}
+
+    # The server notices the disconnect well before the filler runs out
+    for _ in range(200):
+        if "chunks" in sent:
+            break
+        time.sleep(0.02)
+    assert sent["chunks"] < 500
+
+
+def test_transient_errors_are_retried(ollama):
+    def respond(handler, request):
+        if len(ollama.requests) == 1:
+            reply(handler, 503, {"error": "server busy"})
+        else:
+            reply(handler, 200, {"response": ANSWER, "done": True})
+
+    ollama.respond = respond
+    client = OllamaHTTPClient(ollama.url, stream=False)
+
+    result = generate("evidence", client=client, retries=2, backoff=0)
+
+    assert result["response"] == ANSWER
+    assert result["metrics"]["retries"] == 1
+    assert len(ollama.requests) == 2
+
+
+def test_client_errors_are_not_retried(ollama):
+    ollama.respond = lambda handler, request: reply(handler, 400, {"error": "bad request"})
+    client = OllamaHTTPClient(ollama.url, stream=False)
+
+    with pytest.raises(LLMClientError, match="bad request"):
+        generate("evidence", client=client, retries=2, backoff=0)
+    assert len(ollama.requests) == 1
+
+
+def _truncated(handler, request):
+    """Promise a full body (or stream) and hang up partway through it."""
+
+    if request.get("stream"):
+        handler.send_response(200)
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+        handler.wfile.write(b"40\r\n{\"response\": \"QUESTION: Why")
+    else:
+        handler.send_response(200)
+        handler.send_header("Content-Length", "200")
+        handler.end_headers()
+        handler.wfile.write(b'{"response": "QUESTION: Why')
+    handler.wfile.flush()
+    handler.close_connection = True
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_truncated_response_raises_retryable_error(ollama, streamed):
+    ollama.respond = _truncated
+    client = OllamaHTTPClient(ollama.url, stream=streamed)
+
+    with pytest.raises(LLMClientError) as error:
+        client.generate("evidence")
+    assert error.value.retryable
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_truncated_response_is_retried(ollama, streamed):
+    def respond(handler, request):
+        if len(ollama.requests) == 1:
+            _truncated(handler, request)
+        else:
+            answer(handler, request)
+
+    ollama.respond = respond
+    client = OllamaHTTPClient(ollama.url, stream=streamed)
+
+    result = generate("evidence", client=client, retries=1, backoff=0)
+
+    assert result["response"] == ANSWER
+    assert len(ollama.requests) == 2
+
+
+def test_prefill_saving_credits_only_the_shared_prefix(ollama):
+    cold_evidence, warm_evidence = "x" * 3200, "y" * 400
+    prefix = 200
+
+    def respond(handler, request):
+        evidence = estimate_tokens(request["prompt"])
+        cold = len(ollama.requests) == 1
+        reply(handler, 200, {
+            "response": ANSWER,
+            "done": True,
+            "prompt_eval_count": evidence + (prefix if cold else 0),
+            "prompt_eval_duration": 10 ** 9,
+        })
+
+    ollama.respond = respond
+    client = OllamaHTTPClient(ollama.url, stream=False)
+    try:
+        cold = client.generate(cold_evidence, system="SYSTEM")
+        warm = client.generate(warm_evidence, system="SYSTEM")
+    finally:
+        client.close()
+
+    cold_tokens = estimate_tokens(cold_evidence) + prefix
+    assert cold["metrics"]["prefill_saved_seconds"] == 0.0
+    assert warm["metrics"]["prefill_saved_seconds"] == round(prefix / cold_tokens, 3)
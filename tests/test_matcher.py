@@ -0,0 +1,63 @@
+# tests/test_matcher.py
+
+import random
+import re
+
+from evidence.matcher import build_matcher, match_banks
+from evidence.signals import PHRASE_BANKS, PHRASE_MATCHER
+
+
+def _regex_matches(text: str, patterns: list) -> list:
+    """The per-pattern search extract_signals used before the matcher."""
+    lowered = text.lower()
+    return [p for p in patterns if re.search(p, lowered)]
+
+
+def _random_text(rng: random.Random) -> str:
+    fragments = [
+        "limitation", "limitations", "future", "work", "further research",
+        "not", "evaluated", "investigated", "was not assessed", "may", "might",
+        "could", "suggest", "suggests", "appear to", "appears", "unclear",
+        "unknown", "clear", "we assume", "it is assumed", "generally",
+        "widely accepted", "commonly believed", "it is believed", "the",
+        "model", "data", "results", "remains to be determined", "MAY",
+        "Limitations", "İ", "mayor", "couldn't",
+    ]
+    words = [rng.choice(fragments) for _ in range(rng.randint(0, 40))]
+    separators = [" ", " ", " ", ", ", ". ", "\n", ""]
+    return "".join(word + rng.choice(separators) for word in words)
+
+
+def test_matches_per_pattern_regex_on_random_text():
+    rng = random.Random(11)
+
+    for _ in range(3000):
+        text = _random_text(rng)
+        counts = match_banks(text, PHRASE_MATCHER)["counts"]
+        for bank, patterns in PHRASE_BANKS.items():
+            assert list(counts[bank]) == _regex_matches(text, patterns), text
+
+
+def test_counts_and_offsets_of_overlapping_phrases():
+    text = "Limitations: one limitation remains; future work may help."
+    matches = match_banks(text, PHRASE_MATCHER)
+
+    assert matches["counts"]["limitation"] == {
+        "limitation": 2, "limitations": 1, "future work": 1,
+    }
+    for _, start, end in matches["hits"]["limitation"]:
+        assert text[start:end].lower() in ("limitation", "limitations", "future work")
+
+
+def test_regex_patterns_fall_back_to_alternatives():
+    matcher = build_matcher({"numbers": [r"\d+ participants", "sample size"]})
+    counts = match_banks("Only 9 participants; sample size is small.", matcher)["counts"]
+    assert counts["numbers"] == {r"\d+ participants": 1, "sample size": 1}
+
+
+def test_seen_prefix_is_left_out():
+    text = "a limitation here and another limitation there"
+    seen = text.index("here")
+
+    hits = match_banks(text, PHRASE_MATCHER, seen)["hits"]["limitation"]
+    assert [start for _, start, _ in hits] == [text.rindex("limitation")]
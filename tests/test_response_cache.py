@@ -0,0 +1,16 @@
+# tests/test_response_cache.py
+
+from reasoning.response_cache import ResponseCache
+
+
+def test_read_only_cache_opens_paths_with_uri_characters(tmp_path):
+    path = tmp_path / "runs #1?50%" / "responses.sqlite3"
+    cache = ResponseCache(str(path))
+    cache.put("tiny", "sha256:abc", "prompt", "QUESTION: Why?")
+    cache.close()
+
+    cache = ResponseCache(str(path), read_only=True)
+    try:
+        assert cache.get("tiny", "sha256:abc", "prompt") == "QUESTION: Why?"
+    finally:
+        cache.close()
@@ -0,0 +1,114 @@
+# tests/test_response_parser.py
+
+import json
+
+import pytest
+
+from reasoning.response_parser import (
+    REFUSAL,
+    is_well_formed,
+    parse_json_answer,
+    parse_json_answers,
+    parse_numbered_answers,
+)
+
+
+def _answer(topic: str) -> str:
+    return f"QUESTION: Why {topic}?\nWHY: It was not tested.\nMISSING: A {topic} study."
+
+
+def test_numbered_answers_are_split_by_header():
+    response = f"[1] {_answer('one')}\n\n[2]\n{REFUSAL}\n[3] {_answer('three')}"
+
+    answers = parse_numbered_answers(response, 3)
+
+    assert answers == {1: _answer("one"), 2: REFUSAL, 3: _answer("three")}
+
+
+def test_missing_numbers_are_left_out():
+    response = f"[1] {_answer('one')}\n[3] {_answer('three')}"
+
+    assert set(parse_numbered_answers(response, 3)) == {1, 3}
+
+
+def test_repeated_numbers_are_dropped_entirely():
+    response = f"[1] {_answer('one')}\n[2] {_answer('two')}\n[2] {_answer('again')}"
+
+    assert set(parse_numbered_answers(response, 2)) == {1}
+
+
+def test_out_of_range_numbers_are_ignored():
+    response = f"[0] {_answer('zero')}\n[1] {_answer('one')}\n[4] {_answer('four')}"
+
+    assert parse_numbered_answers(response, 3) == {1: _answer("one")}
+
+
+def test_malformed_answers_are_dropped():
+    truncated = "QUESTION: Why?\nWHY: It was not tested."
+    out_of_order = "WHY: It was not tested.\nQUESTION: Why?\nMISSING: A study."
+    empty = "QUESTION: Why?\nWHY:\nMISSING: A study."
+    response = f"[1] {truncated}\n[2] {out_of_order}\n[3] {empty}\n[4] {_answer('four')}"
+
+    assert set(parse_numbered_answers(response, 4)) == {4}
+    assert not any(is_well_formed(a) for a in (truncated, out_of_order, empty))
+
+
+def test_bracketed_numbers_inside_an_answer_are_not_headers():
+    answer = "QUESTION: Why does [2] fail?\nWHY: See ref [3].\nMISSING: A replication."
+
+    assert parse_numbered_answers(f"[1] {answer}", 3) == {1: answer}
+
+
+def _json_answer(topic: str, number: int = None, valid: bool = True) -> dict:
+    answer = {
+        "valid": valid,
+        "question": f"Why {topic}?" if valid else "",
+        "why": "It was not tested." if valid else "",
+        "missing": f"A {topic} study." if valid else "",
+    }
+    if number is not None:
+        answer["number"] = number
+    return answer
+
+
+def test_json_answer_renders_as_text_answer():
+    assert parse_json_answer(json.dumps(_json_answer("one"))) == _answer("one")
+    assert parse_json_answer(json.dumps(_json_answer("one", valid=False))) == REFUSAL
+
+
+@pytest.mark.parametrize("response", [
+    "QUESTION: Why?",
+    '{"valid": true, "question": "Why?"}',
+    '{"valid": "yes", "question": "Why?", "why": "W.", "missing": "M."}',
+    '[{"valid": true, "question": "Why?", "why": "W.", "missing": "M."}]',
+])
+def test_json_answer_rejects_other_shapes(response):
+    assert parse_json_answer(response) is None
+
+
+def test_json_answer_with_an_empty_field_is_not_well_formed():
+    answer = dict(_json_answer("one"), why=" ")
+
+    assert not is_well_formed(parse_json_answer(json.dumps(answer)))
+
+
+def test_json_answers_keep_only_unique_in_range_numbers():
+    items = [
+        _json_answer("one", 1),
+        _json_answer("two", 2),
+        _json_answer("again", 2),
+        _json_answer("zero", 0),
+        _json_answer("four", 4),
+        _json_answer("flag", True),
+        dict(_json_answer("three", 3), why=""),
+        {"number": 3, "valid": True},
+    ]
+
+    answers = parse_json_answers(json.dumps({"answers": items}), 3)
+
+    assert answers == {1: _answer("one")}
+
+
+@pytest.mark.parametrize("response", ["not json", "[]", '{"answers": {}}', '{"other": []}'])
+def test_json_answers_without_an_answer_list_are_empty(response):
+    assert parse_json_answers(response, 2) == {}
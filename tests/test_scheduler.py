@@ -0,0 +1,123 @@
+# tests/test_scheduler.py
+
+import time
+
+from pipeline.scheduler import schedule
+
+
+def _signal(paper_id: str, score: int) -> dict:
+    return {"paper_id": paper_id, "signal_score": score}
+
+
+def _answer(signal: dict) -> dict:
+    return {"paper_id": signal["paper_id"], "signal_score": signal["signal_score"]}
+
+
+def _dispatcher(sent: list, answer=_answer, seconds: float = 0.0):
+    def dispatch(batch):
+        time.sleep(seconds)
+        sent.append(list(batch))
+        return [answer(signal) for signal in batch]
+    return dispatch
+
+
+def test_strongest_signals_go_first_within_the_paper_quota():
+    signals = [_signal("A", 7), _signal("B", 5), _signal("A", 9), _signal("A", 8)]
+    sent = []
+
+    questions, stats = schedule(signals, _dispatcher(sent), max_questions=10, per_paper_quota=2)
+
+    assert [q["signal_score"] for q in questions] == [9, 8, 5]
+    assert stats["skipped_quota"] == 1
+    assert stats["stop_reason"] == "exhausted"
+
+
+def test_refusals_do_not_count_towards_max_questions():
+    signals = [_signal("A", score) for score in (9, 8, 7, 6)]
+    sent = []
+    refuse_first_two = lambda signal: None if signal["signal_score"] > 7 else _answer(signal)
+
+    questions, stats = schedule(
+        signals, _dispatcher(sent, refuse_first_two), max_questions=1, batch_size=1
+    )
+
+    assert [q["signal_score"] for q in questions] == [7]
+    assert stats["dispatched"] == 3
+    assert stats["stop_reason"] == "max_questions"
+
+
+def test_max_calls_caps_dispatched_signals():
+    signals = [_signal("A", score) for score in range(10)]
+    sent = []
+
+    _, stats = schedule(signals, _dispatcher(sent), max_questions=10, max_calls=3, batch_size=2)
+
+    assert [len(batch) for batch in sent] == [2, 1]
+    assert stats["stop_reason"] == "max_calls"
+
+
+def test_admit_rejections_use_neither_budget_nor_quota():
+    signals = [_signal("A", 9), _signal("A", 8), _signal("A", 7)]
+    sent = []
+
+    questions, stats = schedule(
+        signals,
+        _dispatcher(sent),
+        max_questions=10,
+        max_calls=1,
+        per_paper_quota=1,
+        admit=lambda signal: signal["signal_score"] != 9
+    )
+
+    assert [q["signal_score"] for q in questions] == [8]
+    assert stats["skipped_admit"] == 1
+    assert stats["skipped_quota"] == 0
+
+
+def test_passed_deadline_falls_back_without_dispatching():
+    signals = [_signal("A", score) for score in (9, 8, 7)]
+    sent = []
+
+    questions, stats = schedule(
+        signals,
+        _dispatcher(sent),
+        max_questions=2,
+        deadline=time.monotonic() - 1,
+        fallback=lambda signal: {**_answer(signal), "heuristic": True}
+    )
+
+    assert sent == []
+    assert [q["signal_score"] for q in questions] == [9, 8]
+    assert stats["stop_reason"] == "deadline"
+    assert (stats["accepted"], stats["fallback"]) == (0, 2)
+
+
+def test_batch_predicted_to_overrun_the_deadline_is_not_started():
+    signals = [_signal("A", score) for score in (9, 8, 7)]
+    sent = []
+
+    questions, stats = schedule(
+        signals,
+        _dispatcher(sent, seconds=0.2),
+        max_questions=3,
+        deadline=time.monotonic() + 0.3,
+        fallback=lambda signal: {**_answer(signal), "heuristic": True}
+    )
+
+    assert len(sent) == 1
+    assert [q.get("heuristic", False) for q in questions] == [False, True, True]
+    assert (stats["accepted"], stats["fallback"]) == (1, 2)
+
+
+def test_heuristic_answers_do_not_end_dispatching():
+    signals = [_signal("A", score) for score in (9, 8, 7)]
+    sent = []
+    fail_first = lambda signal: (
+        {**_answer(signal), "heuristic": True} if signal["signal_score"] == 9 else _answer(signal)
+    )
+
+    questions, stats = schedule(signals, _dispatcher(sent, fail_first), max_questions=1)
+
+    assert len(sent) == 2
+    assert [q["signal_score"] for q in questions] == [9, 8]
+    assert (stats["accepted"], stats["fallback"]) == (1, 1)